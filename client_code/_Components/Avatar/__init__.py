@@ -22,7 +22,6 @@ class Avatar(AvatarTemplate):
         # Set Form properties and Data Bindings.
         self.tag = ComponentTag()
         self._props = properties
-        self._tooltip_node = None
         self.initials_div = self.dom_nodes['anvil-m3-avatar-initials']
         self.fallback_icon_div = self.dom_nodes['anvil-m3-avatar-icon']
         self.image_div = self.dom_nodes['anvil-m3-avatar-image']
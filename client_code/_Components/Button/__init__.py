@@ -28,7 +28,6 @@ class Button(ButtonTemplate):
         self.tag = ComponentTag()
         self._props = properties
 
-        self._tooltip_node = None
         self.init_components(**properties)
 
         self.dom_nodes['anvil-m3-button'].addEventListener("click", self._handle_click)
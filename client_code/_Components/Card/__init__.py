@@ -5,6 +5,7 @@ from ..._utils.properties import (
     anvil_prop,
     color_property,
     get_unset_spacing,
+    init_properties,
     role_property,
     spacing_property,
     style_property,
@@ -15,11 +16,9 @@ from ._anvil_designer import CardTemplate
 
 class Card(CardTemplate):
     def __init__(self, **properties):
-        self.tooltip_node = None
         self.tag = ComponentTag()
         self._props = properties
-        self._tooltip_node = None
-        self.init_components(**properties)
+        init_properties(self, properties)
 
     def _anvil_get_unset_property_values_(self):
         el = self.dom_nodes["anvil-m3-card"]
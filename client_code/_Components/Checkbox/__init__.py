@@ -29,7 +29,6 @@ class Checkbox(CheckboxTemplate):
     def __init__(self, **properties):
         self.tag = ComponentTag()
         self._props = properties
-        self._tooltip_node = None
         self._allow_indeterminate = properties['allow_indeterminate']
         # Set Form properties and Data Bindings.
         self.init_components(**properties)
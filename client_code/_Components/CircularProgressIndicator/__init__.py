@@ -18,7 +18,6 @@ from ._anvil_designer import CircularProgressIndicatorTemplate
 class CircularProgressIndicator(CircularProgressIndicatorTemplate):
     def __init__(self, **properties):
         self.tag = ComponentTag()
-        self._tooltip_node = None
         self._props = properties
         self.init_components(**properties)
 
@@ -1,29 +1,176 @@
+from bisect import bisect_left, bisect_right
+
 import anvil
 import anvil.designer
 import anvil.server
 from anvil.js import get_dom_node
-from anvil.js.window import document
+from anvil.js.window import requestAnimationFrame, window
 
-from ..._utils import fui, noop
+from ..._utils import events, fui, noop, portal
 from ..._utils.properties import (
     anvil_prop,
     get_unset_margin,
     get_unset_value,
     inline_editing,
     margin_property,
+    theme_color_to_css,
 )
-from ..MenuItem import MenuItem
+from ..MenuItem import _get_item_prototype
 from ._anvil_designer import DropdownMenuTemplate
 
+# Placeholder key for items whose values can't be hashed
+_UNHASHABLE = object()
+
+# Virtualized menus: the default row height and the menu's vertical padding (px),
+# and the number of rows rendered beyond each edge of the view
+_ROW_HEIGHT = 48
+_MENU_PADDING = 8
+_OVERSCAN = 5
+
+# The label styles set by the items_* properties: (css property, css value)
+_ITEM_STYLES = {
+    "items_bold": ("fontWeight", lambda v: "bold" if v else "normal"),
+    "items_italic": ("fontStyle", lambda v: "italic" if v else "normal"),
+    "items_underline": ("textDecoration", lambda v: "underline" if v else "none"),
+    "items_text_color": ("color", lambda v: theme_color_to_css(v) if v else ""),
+    "items_font_family": ("fontFamily", lambda v: v or ""),
+    "items_font_size": ("fontSize", lambda v: f"{v}px" if v else ""),
+}
+
+
+class _OptionRow:
+    """A menu row built by cloning the dropdown's prototype row.
+    Much cheaper to create than a MenuItem component."""
+
+    def __init__(self, node, index):
+        self.node = node
+        self.label_node = node.querySelector('.anvil-m3-menuItem-labelText')
+        self.value = None
+        self.label = None
+        self.placeholder = False
+        self.index = None
+        self._text = ""
+        self._enabled = True
+        self._visible = True
+        self._hover = False
+        self._match = False
+        self.set_index(index)
+
+    def set_index(self, index):
+        # used by the menu's click handler to find the row
+        if index != self.index:
+            self.index = index
+            self.node.setAttribute('data-index', index)
+
+    def set_text(self, text):
+        if text != self._text:
+            self._text = text
+            self.label_node.textContent = text
+
+    def set_enabled(self, enabled):
+        if enabled != self._enabled:
+            self._enabled = enabled
+            self.node.classList.toggle('anvil-m3-menuItem-disabled', not enabled)
+
+    def set_visible(self, visible):
+        if visible != self._visible:
+            self._visible = visible
+            self.node.style.display = '' if visible else 'none'
+
+    def set_match(self, match):
+        # while the menu is filtered, only matching rows are displayed
+        if match != self._match:
+            self._match = match
+            self.node.classList.toggle('anvil-m3-dropdownMenu-filterMatch', match)
+
+    def set_hover(self, hover):
+        if hover != self._hover:
+            self._hover = hover
+            self.node.classList.toggle(
+                'anvil-m3-menuItem-container-keyboardHover', hover
+            )
+
+
+def _parse_items(items):
+    """Split items (strings or (label, value) pairs) into lists of labels and values."""
+    labels = []
+    values = []
+    for i, item in enumerate(items or []):
+        if isinstance(item, str):
+            labels.append(item)
+            values.append(item)
+        elif not isinstance(item, (tuple, list)):
+            raise TypeError("DropdownMenu items must be a list of strings or tuples")
+        else:
+            label, item_value = item
+            if not isinstance(label, str):
+                raise TypeError(
+                    "Dropdown item tuples must be of the form ('label', value),"
+                    f" (at item ${i} got {item!r})"
+                )
+
+            labels.append(label)
+            values.append(item_value)
+    return labels, values
+
+
+def _add_reusable(reusable, item):
+    try:
+        reusable.setdefault(item.value, []).append(item)
+    except TypeError:
+        # unhashable values (dicts, lists) can't be matched by key
+        reusable.setdefault(_UNHASHABLE, []).append(item)
+
+
+def _pop_reusable(reusable, value):
+    try:
+        items = reusable.get(value)
+    except TypeError:
+        return None
+    if not items:
+        return None
+    return items.pop(0)
+
 
 class DropdownMenu(DropdownMenuTemplate):
     def __init__(self, **properties):
         self._init = False
         self.tag = anvil.ComponentTag()
         self._props = properties
-        self._clean_items = []
+        # items are stored as parallel lists of labels and values
+        self._item_labels = []
+        self._item_values = []
+        self._value_index = {}
+        self._unhashable_indices = []
+        # type-ahead filtering
+        self._prefix_keys = None
+        self._prefix_indices = None
+        self._initial_index = None
+        self._filter_indices = None
+        self._filter_positions = None
+        # paged items provider
+        self._provider = None
+        self._page_size = 50
+        self._provider_cache = {}
+        self._provider_entry = None
+        self._selected_entry = None
+        self._menu_built = False
         self._children = []
+        self._children_offset = 0
+        self._matched_rows = []
+        self._placeholder_item = None
+        self._row_prototype = None
+        self._rows_panel = None
+        self._rows_node = None
+        # virtualized rendering
+        self._pool = []
+        self._window_start = 0
+        self._window_size = 0
+        self._row_height = _ROW_HEIGHT
+        self._row_height_measured = False
+        self._render_pending = False
         self._hoverIndex = None
+        self._hovered_row = None
         self.selected_value = None
         self._set_designer_text_placeholder, self._start_inline_editing = (
             inline_editing(
@@ -34,8 +181,14 @@ class DropdownMenu(DropdownMenuTemplate):
             )
         )
         self._cleanup = noop
+        self._shown = False
+        self._menu_attached = False
         self._has_focus = False
         self._menuNode = self.dom_nodes['anvil-m3-dropdownMenu-items-container']
+        # The menu node only lives in the document while the menu is open (or was
+        # recently open, see _utils.portal)
+        self._menuNode.remove()
+        self._menuNode.addEventListener('scroll', self._on_menu_scroll)
         self._field = self.selection_field.dom_nodes['anvil-m3-textbox']
 
         self.init_components(**properties)
@@ -52,23 +205,18 @@ class DropdownMenu(DropdownMenuTemplate):
         self.selection_field.dom_nodes['anvil-m3-textbox'].addEventListener(
             'blur', self._handle_selection_field_blur
         )
+        self._field.addEventListener('input', self._handle_field_input)
 
         self.add_event_handler("x-anvil-page-added", self._on_mount)
         self.add_event_handler("x-anvil-page-removed", self._on_cleanup)
 
-        self.selection_field.dom_nodes[
-            'anvil-m3-textbox'
-        ].style.caretColor = 'transparent'
-        self.selection_field.dom_nodes['anvil-m3-textbox'].style.cursor = "pointer"
-        self.selection_field.dom_nodes['anvil-m3-textbox'].setAttribute(
-            "readonly", True
-        )
+        self._update_field_mode()
 
         if anvil.designer.in_designer:
             self._menuNode.classList.toggle("anvil-m3-menu-hidden", True)
 
         self._init = True
-        self._create_menu_items()
+        self._refresh_menu()
 
     def _anvil_get_unset_property_values_(self):
         el = self.dom_nodes['anvil-m3-dropdownMenu-textbox']
@@ -96,26 +244,49 @@ class DropdownMenu(DropdownMenuTemplate):
         }
 
     def _on_mount(self, **event_args):
-        document.addEventListener('keydown', self._handle_keyboard_events)
-        document.addEventListener('click', self._body_click)
-        document.body.append(self._menuNode)
-        self._cleanup = fui.auto_update(
-            self._field, self._menuNode, placement="bottom-start", offset=0
-        )
+        self._shown = True
+        if self._has_focus:
+            events.subscribe('keydown', self._handle_keyboard_events)
         self._menuNode.addEventListener('click', self._child_clicked)
+        if self.menu.visible:
+            self._attach_menu()
 
     def _on_cleanup(self, **event_args):
-        document.removeEventListener('keydown', self._handle_keyboard_events)
-        document.removeEventListener('click', self._body_click)
+        self._shown = False
+        events.unsubscribe('keydown', self._handle_keyboard_events)
         self._menuNode.removeEventListener('click', self._child_clicked)
+        self._detach_menu()
+        portal.detach(self._menuNode)
+
+    def _attach_menu(self):
+        if not self._shown or self._menu_attached:
+            return
+        self._menu_attached = True
+        # Put the menu in the portal on the body while it is open
+        # This gets around the fact that Anvil containers set their overflow to hidden
+        portal.attach(self._menuNode)
+        # Document clicks only matter while the menu is open
+        events.subscribe('click', self._body_click)
+        self._cleanup = fui.auto_update(
+            self._field, self._menuNode, placement="bottom-start", offset=0
+        )
+
+    def _detach_menu(self):
+        if not self._menu_attached:
+            return
+        self._menu_attached = False
+        events.unsubscribe('click', self._body_click)
         self._cleanup()
-        self._menuNode.remove()
+        self._cleanup = noop
+        portal.release(self._menuNode)
 
     def _handle_selection_field_focus(self, event):
         self._has_focus = True
+        events.subscribe('keydown', self._handle_keyboard_events)
 
     def _handle_selection_field_blur(self, event):
         self._has_focus = False
+        events.unsubscribe('keydown', self._handle_keyboard_events)
 
     def _handle_keyboard_events(self, event):
         if not self._has_focus:
@@ -123,6 +294,23 @@ class DropdownMenu(DropdownMenuTemplate):
         else:
             action_keys = set(["ArrowUp", "ArrowDown", "Tab", "Escape", " ", "Enter"])
             open_keys = set(["ArrowUp", "ArrowDown", " ", "Enter"])
+            if self.filterable:
+                # space is typed into the filter
+                action_keys.discard(" ")
+                open_keys.discard(" ")
+            key = event.key
+            if (
+                not self.filterable
+                and len(key) == 1
+                and key != " "
+                and not (event.ctrlKey or event.metaKey or event.altKey)
+            ):
+                # jump to the next item starting with the typed character
+                if not self.menu.visible:
+                    self._set_menu_visibility(True)
+                self._jump_to_initial(key)
+                return
+
             if not self.menu.visible:
                 if event.key in open_keys:
                     self._set_menu_visibility(True)
@@ -147,53 +335,136 @@ class DropdownMenu(DropdownMenuTemplate):
                 self._attempt_select(event)
 
     def _iterate_hover(self, inc=True):
+        count = self._row_count()
+        if not count:
+            return
         if inc:
-            if self._hoverIndex is None or self._hoverIndex is (
-                len(self._children) - 1
-            ):
+            if self._hoverIndex is None or self._hoverIndex >= count - 1:
                 self._hoverIndex = -1
             self._hoverIndex += 1
         else:
             if self._hoverIndex is None or self._hoverIndex == 0:
-                self._hoverIndex = len(self._children)
+                self._hoverIndex = count
             self._hoverIndex -= 1
-        self._children[self._hoverIndex].dom_nodes[
-            'anvil-m3-menuItem-container'
-        ].scrollIntoView({'block': 'nearest'})
+        self._scroll_row_into_view(self._hoverIndex)
+        self._update_hover_styles()
+
+    def _jump_to_initial(self, char):
+        if self._initial_index is None:
+            # built once per items assignment, on the first jump
+            initial_index = self._initial_index = {}
+            for index, label in enumerate(self._item_labels):
+                if label:
+                    initial_index.setdefault(label[0].lower(), []).append(index)
+        indices = self._initial_index.get(char.lower())
+        if not indices:
+            return
+        offset = int(self._has_placeholder())
+        current = -1 if self._hoverIndex is None else self._hoverIndex - offset
+        # the first match after the hovered row, wrapping round to the start
+        position = bisect_right(indices, current)
+        index = indices[position] if position < len(indices) else indices[0]
+        self._hoverIndex = index + offset
+        self._scroll_row_into_view(self._hoverIndex)
         self._update_hover_styles()
 
     def _attempt_select(self, event):
-        if self._hoverIndex is not None:
-            self._children[self._hoverIndex].raise_event(
-                "click",
-                event=event,
-                keys={
-                    "shift": event.shiftKey,
-                    "alt": event.altKey,
-                    "ctrl": event.ctrlKey,
-                    "meta": event.metaKey,
-                },
-            )
+        # the hovered row may have been scrolled out of the rendered rows,
+        # so select from the logical list rather than from a rendered row
+        if self._hoverIndex is not None and self._hoverIndex < self._row_count():
+            self._select_entry(self._row_entry(self._hoverIndex))
         self._set_menu_visibility(False)
 
-    def _clear_hover_styles(self):
-        if self._children is not None:
-            for child in self._children:
-                child.dom_nodes['anvil-m3-menuItem-container'].classList.toggle(
-                    'anvil-m3-menuItem-container-keyboardHover', False
-                )
-
     def _update_hover_styles(self):
-        self._clear_hover_styles()
-        if self._hoverIndex is None:
-            return
-        self._children[self._hoverIndex].dom_nodes[
-            'anvil-m3-menuItem-container'
-        ].classList.toggle('anvil-m3-menuItem-container-keyboardHover', True)
+        # Only the previously hovered row and the newly hovered row are touched
+        row = None
+        if self._hoverIndex is not None:
+            row = self._row_component(self._hoverIndex)
+        old = self._hovered_row
+        if old is not None and old is not row:
+            old.set_hover(False)
+        if row is not None:
+            row.set_hover(True)
+        self._hovered_row = row
 
     def _handle_component_click(self, event):
+        if self.filterable and self.menu.visible and self._field.contains(event.target):
+            # clicking into the field to edit the filter keeps the menu open
+            return
         self._set_menu_visibility()
 
+    def _update_field_mode(self):
+        if self.filterable:
+            self._field.style.caretColor = ''
+            self._field.style.cursor = "text"
+            self._field.removeAttribute("readonly")
+        else:
+            self._field.style.caretColor = 'transparent'
+            self._field.style.cursor = "pointer"
+            self._field.setAttribute("readonly", True)
+
+    def _handle_field_input(self, event):
+        if not self.filterable:
+            return
+        if not self.menu.visible:
+            self._set_menu_visibility(True)
+        self._set_filter(self._field.value)
+
+    def _build_prefix_index(self):
+        # Built once per items assignment, on the first keystroke that needs it
+        pairs = sorted(
+            (label.lower(), index) for index, label in enumerate(self._item_labels)
+        )
+        self._prefix_keys = [key for key, _ in pairs]
+        self._prefix_indices = [index for _, index in pairs]
+
+    def _match_prefix(self, query):
+        """The indices of the items whose labels start with query, in item order."""
+        if self._prefix_keys is None:
+            self._build_prefix_index()
+        query = query.lower()
+        keys = self._prefix_keys
+        start = bisect_left(keys, query)
+        end = bisect_left(keys, query + "\uffff", start)
+        return sorted(self._prefix_indices[start:end])
+
+    def _set_filter(self, query):
+        if self._provider is not None:
+            # the provider does the filtering
+            self._set_provider_query(query)
+        elif query:
+            matches = self._filter_indices = self._match_prefix(query)
+            self._filter_positions = {item: row for row, item in enumerate(matches)}
+        else:
+            self._filter_indices = None
+            self._filter_positions = None
+        self._hoverIndex = 0 if self._row_count() else None
+        if self.virtualize:
+            self._menuNode.scrollTop = 0
+        if self.virtualize or self._provider is not None:
+            self._render_rows()
+        elif self._menu_built:
+            self._update_filter_matches()
+        self._update_hover_styles()
+        if self._provider is not None:
+            self._load_more_if_needed()
+
+    def _clear_filter(self):
+        filtered = self._filter_indices is not None
+        if self._provider is not None and self._provider_entry["query"]:
+            filtered = True
+            self._set_provider_query("")
+        self._filter_indices = None
+        self._filter_positions = None
+        if filtered and not self.virtualize:
+            if self._provider is not None:
+                # the provider's full list is reconciled the next time the menu opens
+                self._menu_built = False
+            elif self._menu_built:
+                self._update_filter_matches()
+        # replace the query with the selected item's label
+        self.selected_value = self.selected_value
+
     def _set_menu_visibility(self, value=None):
         if value is None:
             value = not self.menu.visible
@@ -202,29 +473,36 @@ class DropdownMenu(DropdownMenuTemplate):
         self._menuNode.classList.toggle("anvil-m3-menu-hidden", not value)
 
         if value:
+            if not self._menu_built:
+                self._menu_built = True
+                if not self.virtualize:
+                    self._update_menu_items()
+            self._attach_menu()
             selection_field_width = get_dom_node(self.selection_field).offsetWidth
             self._menuNode.style.width = f"{selection_field_width}px"
 
             # dealing with hover
-            selected_value = self.selected_value
-            for index, child in enumerate(self._children):
-                if child.tag.value == selected_value:
-                    self._hoverIndex = index
-                    break
-            else:  # no break
-                self._hoverIndex = None
+            self._hoverIndex = self._find_row(self.selected_value)
+            if self.virtualize:
+                self._render_window()
+                # render again once floating-ui has positioned and sized the menu
+                self._schedule_render_window()
 
             self._update_hover_styles()
 
             if not anvil.designer.in_designer:
                 self.selection_field.trailing_icon = "mi:arrow_drop_up"
                 if self._hoverIndex:
-                    self._children[self._hoverIndex].dom_nodes[
-                        'anvil-m3-menuItem-container'
-                    ].scrollIntoView({'block': 'nearest'})
+                    self._scroll_row_into_view(self._hoverIndex)
+
+            if self._provider is not None:
+                self._load_more_if_needed()
 
         else:
+            self._detach_menu()
             self.selection_field.trailing_icon = "mi:arrow_drop_down"
+            if self.filterable:
+                self._clear_filter()
             if self.selected_value is None:
                 self._hoverIndex = None
 
@@ -246,51 +524,321 @@ class DropdownMenu(DropdownMenuTemplate):
     def form_show(self, **event_args):
         self._set_designer_text_placeholder()
 
-    def _create_menu_items(self):
-        self.menu.clear()
-        item_props = {
-            "hide_leading_icon": True,
-            "bold": self.items_bold,
-            "italic": self.items_italic,
-            "underline": self.items_underline,
-            "text_color": self.items_text_color,
-            "font_family": self.items_font_family,
-            "font_size": self.items_font_size,
-        }
-
-        p = MenuItem(**item_props, text=self.placeholder or "")
-        p.tag.value = None
-        p.tag.label = ""
-
-        def _handle_select_placeholder(**e):
+    # The menu's rows are the placeholder (if there is one) followed by the items.
+    # Rows are addressed by their index in that list, whether or not they are
+    # currently rendered. While filtering, the rows are only the matching items.
+    def _show_placeholder(self):
+        return bool(self.allow_none or self.placeholder)
+
+    def _has_placeholder(self):
+        return self._show_placeholder() and self._filter_indices is None
+
+    def _row_count(self):
+        if self._filter_indices is not None:
+            return len(self._filter_indices)
+        return len(self._item_labels) + self._has_placeholder()
+
+    def _row_entry(self, index):
+        """The (label, value) of a row, or None for the placeholder row."""
+        if self._filter_indices is not None:
+            index = self._filter_indices[index]
+        elif self._has_placeholder():
+            if index == 0:
+                return None
+            index -= 1
+        return self._item_labels[index], self._item_values[index]
+
+    def _find_row(self, value):
+        offset = int(self._has_placeholder())
+        if offset and value is None:
+            return 0
+        index = self._find_item(value)
+        if index is None:
+            return None
+        if self._filter_indices is not None:
+            return self._filter_positions.get(index)
+        return index + offset
+
+    def _row_component(self, index):
+        """The _OptionRow displaying a row, or None if the row isn't rendered."""
+        if self.virtualize:
+            offset = index - self._window_start
+            if 0 <= offset < self._window_size:
+                return self._pool[offset]
+            return None
+        if self._filter_indices is not None:
+            # filtered out rows are hidden rather than removed
+            index = self._filter_indices[index] + self._children_offset
+        return self._children[index]
+
+    def _scroll_row_into_view(self, index):
+        if not self.virtualize:
+            self._row_component(index).node.scrollIntoView({'block': 'nearest'})
+            return
+        top = _MENU_PADDING + index * self._row_height
+        bottom = top + self._row_height
+        view_height = self._menuNode.clientHeight
+        if top < self._menuNode.scrollTop:
+            self._menuNode.scrollTop = top
+        elif bottom > self._menuNode.scrollTop + view_height:
+            self._menuNode.scrollTop = bottom - view_height
+        self._render_window()
+
+    def _on_menu_scroll(self, event):
+        if self._provider is not None:
+            self._load_more_if_needed()
+        if self.virtualize:
+            self._schedule_render_window()
+
+    def _schedule_render_window(self):
+        if not self._render_pending:
+            self._render_pending = True
+            requestAnimationFrame(self._render_window)
+
+    def _view_height(self):
+        # The menu is as tall as the max height the size middleware gives it, unless
+        # there are too few rows to fill it. On the first open that hasn't been set
+        # yet (and the menu is still empty), so assume the menu could fill the window.
+        max_height = self._menuNode.style.maxHeight
+        if max_height.endswith("px"):
+            return min(float(max_height[:-2]), window.innerHeight)
+        return window.innerHeight
+
+    def _render_window(self, *args):
+        """Render the rows in view (plus an overscan margin) using a pool of rows.
+        The space taken by rows out of view is kept as padding on the menu."""
+        self._render_pending = False
+        if not self.virtualize or not self.menu.visible:
+            return
+        count = self._row_count()
+        h = self._row_height
+        view_height = self._view_height()
+        first = max(0, int((self._menuNode.scrollTop - _MENU_PADDING) // h))
+        first = max(0, first - _OVERSCAN)
+        last = min(count, first + int(view_height // h) + 1 + 2 * _OVERSCAN)
+
+        rows_node = self._get_rows_node()
+        while len(self._pool) < last - first:
+            row = self._new_row(len(self._pool))
+            rows_node.append(row.node)
+            self._pool.append(row)
+
+        for offset, row in enumerate(self._pool):
+            index = first + offset
+            if index < last:
+                self._show_row(row, index)
+            else:
+                row.set_visible(False)
+
+        self._window_start = first
+        self._window_size = last - first
+        items_container = self.menu.dom_nodes['anvil-m3-menu-items-container']
+        items_container.style.paddingTop = f"{_MENU_PADDING + first * h}px"
+        items_container.style.paddingBottom = f"{_MENU_PADDING + (count - last) * h}px"
+
+        if not self._row_height_measured and self._window_size:
+            measured = self._pool[0].node.offsetHeight
+            if measured:
+                self._row_height_measured = True
+                if measured != h:
+                    self._row_height = measured
+                    self._render_window()
+
+    def _show_row(self, row, index):
+        entry = self._row_entry(index)
+        if entry is None:
+            label, value = self.placeholder or "", None
+        else:
+            label, value = entry
+        row.value = value
+        row.label = label if entry is not None else ""
+        row.placeholder = entry is None
+        row.set_text(label)
+        row.set_enabled(bool(self.allow_none) if entry is None else True)
+        row.set_visible(True)
+        hovered = index == self._hoverIndex
+        row.set_hover(hovered)
+        if hovered:
+            self._hovered_row = row
+
+    def _get_rows_node(self):
+        # The rows live in a single component in the menu's slot,
+        # with one click handler for all of them
+        if self._rows_panel is None:
+            self._rows_panel = anvil.HtmlTemplate()
+            self.menu.add_component(self._rows_panel, slot="anvil-m3-menu-slot")
+            self._rows_node = get_dom_node(self._rows_panel)
+            self._rows_node.addEventListener('click', self._handle_rows_click)
+        return self._rows_node
+
+    def _get_row_prototype(self):
+        if self._row_prototype is None:
+            # Menu rows use the same markup (and so the same CSS) as a MenuItem
+            prototype = self._row_prototype = _get_item_prototype().cloneNode(True)
+            label_node = prototype.querySelector('.anvil-m3-menuItem-labelText')
+            for prop, (css_prop, to_css) in _ITEM_STYLES.items():
+                setattr(label_node.style, css_prop, to_css(getattr(self, prop)))
+        return self._row_prototype
+
+    def _new_row(self, index):
+        return _OptionRow(self._get_row_prototype().cloneNode(True), index)
+
+    def _handle_rows_click(self, event):
+        node = event.target.closest('.anvil-m3-menuItem-container')
+        if node is None:
+            return
+        event.preventDefault()
+        rows = self._pool if self.virtualize else self._children
+        index = int(node.getAttribute('data-index'))
+        if index < len(rows):
+            self._select_row(rows[index])
+
+    def _select_row(self, row):
+        self._select_entry(None if row.placeholder else (row.label, row.value))
+
+    def _select_entry(self, entry):
+        """Select a row's (label, value), or the placeholder if entry is None."""
+        if entry is None:
             if self.allow_none:
                 self.selected_value = None
-            self.raise_event("change")
-
-        if not self.allow_none:
-            p.enabled = False
+        else:
+            label, value = entry
+            # remembered in case the item isn't loaded later (see set_items_provider)
+            self._selected_entry = (value, label)
+            self.selected_value = value
+        self.raise_event("change")
 
+    def _reset_menu(self):
+        self.menu.clear()
+        self._rows_panel = None
+        self._rows_node = None
+        self._hovered_row = None
         self._children = []
+        self._children_offset = 0
+        self._matched_rows = []
+        self._pool = []
+        self._placeholder_item = None
+        self._window_start = 0
+        self._window_size = 0
+        items_container = self.menu.dom_nodes['anvil-m3-menu-items-container']
+        items_container.style.paddingTop = ""
+        items_container.style.paddingBottom = ""
+
+    def _render_rows(self):
+        # Menu items aren't built until the menu is first opened
+        if self.virtualize:
+            self._render_window()
+        elif self._menu_built:
+            self._update_menu_items()
+
+    def _refresh_menu(self):
+        self._render_rows()
+        self.selected_value = self.selected_value
 
-        if self.allow_none or self.placeholder:
-            p.add_event_handler('click', _handle_select_placeholder)
-            self.menu.add_component(p, slot="anvil-m3-menu-slot")
-            self._children.append(p)
-
-        for label, value in self._clean_items:
-            selection = MenuItem(**item_props, text=label)
-            selection.tag.value = value
-            selection.tag.label = label
-
-            def _handle_selection_click(value=value, **e):
-                self.selected_value = value
-                self.raise_event("change")
-
-            selection.add_event_handler('click', _handle_selection_click)
-            self.menu.add_component(selection, slot="anvil-m3-menu-slot")
-            self._children.append(selection)
+    def _get_placeholder_item(self):
+        p = self._placeholder_item
+        if p is None:
+            p = self._placeholder_item = self._new_row(0)
+            p.label = ""
+            p.placeholder = True
+        p.set_text(self.placeholder or "")
+        p.set_enabled(bool(self.allow_none))
+        return p
+
+    def _create_menu_item(self, label, value, index):
+        row = self._new_row(index)
+        row.value = value
+        row.label = label
+        row.set_text(label)
+        return row
+
+    def _update_menu_items(self):
+        """Bring the menu in line with the current items.
+        Existing rows are matched by value, so only the items that changed are
+        created, moved or removed. Every item gets a row, even while filtering."""
+        old_children = self._children
+        has_placeholder = self._show_placeholder()
+        new_children = [self._get_placeholder_item()] if has_placeholder else []
+
+        reusable = {}
+        for child in old_children:
+            if child is not self._placeholder_item:
+                _add_reusable(reusable, child)
+
+        labels, values = self._item_labels, self._item_values
+        for index in range(len(labels)):
+            label, value = labels[index], values[index]
+            item = _pop_reusable(reusable, value)
+            if item is None:
+                item = self._create_menu_item(label, value, len(new_children))
+            else:
+                item.value = value
+                if item.label != label:
+                    item.label = label
+                    item.set_text(label)
+            new_children.append(item)
+
+        for items in reusable.values():
+            for item in items:
+                item.node.remove()
+        placeholder = self._placeholder_item
+        if not has_placeholder and placeholder is not None:
+            placeholder.node.remove()
+
+        # Move and insert so the menu's rows match new_children. The rows already
+        # in the menu are walked alongside new_children: any row that is moved is
+        # skipped when the walk reaches its old position.
+        rows_node = self._get_rows_node()
+        kept = set(id(child) for child in new_children)
+        current = [child for child in old_children if id(child) in kept]
+        moved = set()
+        position = 0
+        for index, item in enumerate(new_children):
+            item.set_index(index)
+            while position < len(current) and id(current[position]) in moved:
+                position += 1
+            if position < len(current) and current[position] is item:
+                position += 1
+                continue
+            before = current[position].node if position < len(current) else None
+            rows_node.insertBefore(item.node, before)
+            moved.add(id(item))
+
+        self._children = new_children
+        self._children_offset = int(has_placeholder)
+        self._update_filter_matches()
+
+    def _update_filter_matches(self):
+        # While filtering, the rows stay in the menu and CSS hides the ones that
+        # aren't marked as matches, so clearing the filter doesn't rebuild anything
+        indices = self._filter_indices
+        children, offset = self._children, self._children_offset
+        matched = [] if indices is None else [children[i + offset] for i in indices]
+        keep = set(id(row) for row in matched)
+        for row in self._matched_rows:
+            if id(row) not in keep:
+                row.set_match(False)
+        for row in matched:
+            row.set_match(True)
+        self._matched_rows = matched
+        self._get_rows_node().classList.toggle(
+            'anvil-m3-dropdownMenu-filtering', indices is not None
+        )
 
-        self.selected_value = self.selected_value
+    def _set_items_style(self, prop, value):
+        # Rows are cloned from the prototype, so it only exists once rows do
+        if self._row_prototype is None:
+            return
+        css_prop, to_css = _ITEM_STYLES[prop]
+        css_value = to_css(value)
+        rows = list(self._pool if self.virtualize else self._children)
+        if self._placeholder_item is not None:
+            # the placeholder row may currently be out of the menu
+            rows.append(self._placeholder_item)
+        label_node = self._row_prototype.querySelector('.anvil-m3-menuItem-labelText')
+        setattr(label_node.style, css_prop, css_value)
+        for row in rows:
+            setattr(row.label_node.style, css_prop, css_value)
 
     # DESIGNER INTERACTIONS
     def _anvil_get_interactions_(self):
@@ -497,15 +1045,20 @@ class DropdownMenu(DropdownMenuTemplate):
         if anvil.designer.in_designer:
             return
 
-        for child in self._children:
-            if child.tag.value == value:
-                self.selection_field.text = child.tag.label
-                break
-        else:  # no break
-            if value is not None:
-                self.selection_field.text = "<Invalid value>"
-            else:
-                self.selection_field.text = ""
+        # the displayed label doesn't depend on the rows currently shown
+        index = None
+        if value is not None or not (self.allow_none or self.placeholder):
+            index = self._find_item(value)
+        selected = self._selected_entry
+        if index is not None:
+            self.selection_field.text = self._item_labels[index]
+        elif selected is not None and selected[0] == value:
+            # the item the user picked may no longer be loaded
+            self.selection_field.text = selected[1]
+        elif value is not None:
+            self.selection_field.text = "<Invalid value>"
+        else:
+            self.selection_field.text = ""
 
     @anvil_prop
     @property
@@ -516,67 +1069,216 @@ class DropdownMenu(DropdownMenuTemplate):
 
     def _recreate_items(self):
         if self._init:
-            self._create_menu_items()
+            self._refresh_menu()
 
     @anvil_prop
     @property
-    def items(self, value):
-        items = value
-        clean_items = self._clean_items = []
-        for i, item in enumerate(items):
-            if isinstance(item, str):
-                clean_items.append((item, item))
-            elif not isinstance(item, (tuple, list)):
-                raise TypeError(
-                    "DropdownMenu items must be a list of strings or tuples"
-                )
-            else:
-                label, value = item
+    def virtualize(self, value) -> bool:
+        """If True, only the menu items in view are rendered. Use this for long lists of items."""
+        if self._init:
+            self._reset_menu()
+            self._refresh_menu()
+
+    @anvil_prop
+    @property
+    def filterable(self, value) -> bool:
+        """If True, typing in the dropdown narrows the menu to the items whose labels start with the typed text."""
+        if self._init:
+            self._update_field_mode()
+            if not value:
+                self._set_menu_visibility(False)
+
+    def _get_items(self):
+        items = self._props.get("items")
+        if items is None:
+            # set_items() doesn't build (label, value) pairs unless they're asked for
+            items = self._props["items"] = list(
+                zip(self._item_labels, self._item_values)
+            )
+        return items
+
+    def _set_items(self, value):
+        self._item_labels, self._item_values = _parse_items(value)
+        self._props["items"] = value
+        self._provider = None
+        self._index_items()
+        self._recreate_items()
+
+    items = property(_get_items, _set_items)
+
+    def set_items(self, labels, values=None, validate=True):
+        """Set the items from parallel sequences of labels and values.
+        If values is None, each label is its own value. Pass validate=False
+        to skip checking sequences that are already known to be valid."""
+        labels = labels if isinstance(labels, list) else list(labels)
+        if values is None:
+            values = labels
+        elif not isinstance(values, list):
+            values = list(values)
+
+        if validate:
+            if len(labels) != len(values):
+                raise ValueError("labels and values must be the same length")
+            for i, label in enumerate(labels):
                 if not isinstance(label, str):
                     raise TypeError(
-                        "Dropdown item tuples must be of the form ('label', value),"
-                        f" (at item ${i} got {item!r})"
+                        f"DropdownMenu labels must be strings (at item {i} got {label!r})"
                     )
 
-                clean_items.append((label, value))
+        self._props["items"] = None
+        self._provider = None
+        self._item_labels = labels
+        self._item_values = values
+        self._index_items()
+        self._recreate_items()
 
+    def set_items_provider(self, provider, page_size=50):
+        """Load the items on demand from provider(offset, limit, query), which returns
+        a list of at most limit items, in the same form as the items property.
+        A page shorter than limit marks the end of the items. Pages are fetched as the
+        menu is scrolled, and cached for each query. If the dropdown is filterable,
+        the typed text is passed to the provider as the query."""
+        self._provider = provider
+        self._page_size = page_size
+        self._provider_cache = {}
+        self._props["items"] = None
+        if provider is None:
+            self._item_labels, self._item_values = [], []
+            self._index_items()
+        else:
+            self._set_provider_query("")
         self._recreate_items()
 
+    def _set_provider_query(self, query):
+        """Show the items loaded so far for query."""
+        entry = self._provider_cache.get(query)
+        if entry is None:
+            entry = self._provider_cache[query] = {
+                "query": query,
+                "labels": [],
+                "values": [],
+                "loading": False,
+                "done": False,
+            }
+        self._provider_entry = entry
+        self._props["items"] = None
+        self._item_labels = entry["labels"]
+        self._item_values = entry["values"]
+        self._index_items()
+
+    def _rows_needed(self):
+        # The rows down to the bottom of the view, plus an overscan margin.
+        # Worked out from the view height rather than the menu's scrollHeight,
+        # which is only as tall as the rows loaded so far until the menu is sized.
+        bottom = self._menuNode.scrollTop + self._view_height()
+        return int(bottom // self._row_height) + 1 + _OVERSCAN
+
+    def _load_more_if_needed(self):
+        # Fetch pages until the rows loaded reach past the bottom of the view
+        if not self.menu.visible or self._provider is None:
+            return
+        entry = self._provider_entry
+        while (
+            entry is self._provider_entry
+            and not entry["done"]
+            and not entry["loading"]
+            and self._row_count() < self._rows_needed()
+        ):
+            self._load_next_page()
+
+    def _load_next_page(self):
+        entry = self._provider_entry
+        if entry["loading"] or entry["done"]:
+            return
+        provider = self._provider
+        offset = len(entry["labels"])
+        entry["loading"] = True
+        try:
+            page = provider(offset, self._page_size, entry["query"])
+        finally:
+            entry["loading"] = False
+        labels, values = _parse_items(page)
+        # The page is cached even if the query has changed while it loaded
+        entry["labels"].extend(labels)
+        entry["values"].extend(values)
+        if len(labels) < self._page_size:
+            entry["done"] = True
+
+        if provider is not self._provider or entry is not self._provider_entry:
+            # a stale response: the menu is showing something else now
+            return
+        self._props["items"] = None
+        self._index_items(offset)
+        self._render_rows()
+
+    def _index_items(self, start=0):
+        """Map each item value to the index of its first occurrence in the items.
+        Unhashable values can't go in the map, so their indices are kept in a list.
+        Pass start to index items appended since the last call."""
+        if start:
+            value_index = self._value_index
+            unhashable = self._unhashable_indices
+        else:
+            value_index = self._value_index = {}
+            unhashable = self._unhashable_indices = []
+        self._prefix_keys = None
+        self._prefix_indices = None
+        self._initial_index = None
+        values = self._item_values
+        for index in range(start, len(values)):
+            value = values[index]
+            try:
+                value_index.setdefault(value, index)
+            except TypeError:
+                unhashable.append(index)
+
+    def _find_item(self, value):
+        try:
+            index = self._value_index.get(value)
+        except TypeError:
+            index = None
+        if index is not None:
+            return index
+        for index in self._unhashable_indices:
+            if self._item_values[index] == value:
+                return index
+        return None
+
     @anvil_prop
     @property
     def items_italic(self, value) -> bool:
         """If True, the menu items will be italic."""
-        self._recreate_items()
+        self._set_items_style("items_italic", value)
 
     @anvil_prop
     @property
     def items_underline(self, value) -> bool:
         """If True, the menu items will be underlined."""
-        self._recreate_items()
+        self._set_items_style("items_underline", value)
 
     @anvil_prop
     @property
     def items_text_color(self, value) -> str:
         """The colour of the menu items' text."""
-        self._recreate_items()
+        self._set_items_style("items_text_color", value)
 
     @anvil_prop
     @property
     def items_bold(self, value) -> bool:
         """If True, the menu items will be bold."""
-        self._recreate_items()
+        self._set_items_style("items_bold", value)
 
     @anvil_prop
     @property
     def items_font_family(self, value) -> str:
         """The font family to use for the menu items."""
-        self._recreate_items()
+        self._set_items_style("items_font_family", value)
 
     @anvil_prop
     @property
     def items_font_size(self, value) -> int:
         """The font size of the menu items."""
-        self._recreate_items()
+        self._set_items_style("items_font_size", value)
 
     #!componentProp(m3.DropdownMenu)!1: {name:"align",type:"enum",options:["left", "right", "center"],description:"The position of this component in the available space."}
     #!componentProp(m3.DropdownMenu)!1: {name:"appearance",type:"enum",options:["filled", "outlined"],description:"A predefined style for this component."}
@@ -620,6 +1322,8 @@ class DropdownMenu(DropdownMenuTemplate):
     #!componentProp(m3.DropdownMenu)!1: {name:"background_color",type:"color",description:"The colour of the background of this component."}
     #!componentProp(m3.DropdownMenu)!1: {name:"placeholder",type:"string",description:"The text to be displayed when the component is empty"}
     #!componentProp(m3.DropdownMenu)!1: {name:"allow_none",type:"boolean",description:"If True, a placeholder item is added to the menu with value None"}
+    #!componentProp(m3.DropdownMenu)!1: {name:"filterable",type:"boolean",description:"If True, typing in the dropdown narrows the menu to the items whose labels start with the typed text."}
+    #!componentProp(m3.DropdownMenu)!1: {name:"virtualize",type:"boolean",description:"If True, only the menu items in view are rendered. Use this for long lists of items."}
     #!componentProp(m3.DropdownMenu)!1: {name:"spacing",type:"spacing",description:"The margin and padding (pixels) of the component."}
     #!componentProp(m3.DropdownMenu)!1: {name:"tooltip",type:"string",description:"The text to display when the mouse is hovered over this component."}
     #!componentProp(m3.DropdownMenu)!1: {name:"items",type:"string list",description:"The items to display in the menu."}
@@ -629,5 +1333,8 @@ class DropdownMenu(DropdownMenuTemplate):
 
     #!componentEvent(m3.DropdownMenu)!1: {name: "change", description: "When an item is selected.", parameters:[]}
 
+    #!defMethod(_)!2: "Set the items from parallel sequences of labels and values." ["set_items"]
+    #!defMethod(_)!2: "Load the items on demand, a page at a time, from a provider function called with (offset, limit, query)." ["set_items_provider"]
+
 
 #!defClass(m3,DropdownMenu, anvil.Component)!:
@@ -21,7 +21,6 @@ class Heading(HeadingTemplate):
     def __init__(self, **properties):
         self.tag = anvil.ComponentTag()
         self._props = properties
-        self._tooltip_node = None
         self._set_designer_text_placeholder, self._start_inline_editing = (
             inline_editing(
                 self,
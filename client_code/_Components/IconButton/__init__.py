@@ -8,6 +8,7 @@ from ..._utils.properties import (
     color_property,
     enabled_property,
     get_unset_margin,
+    init_properties,
     margin_property,
     role_property,
     style_property,
@@ -20,9 +21,8 @@ class IconButton(IconButtonTemplate):
     def __init__(self, **properties):
         self.tag = ComponentTag()
         self._props = properties
-        self._tooltip_node = None
         self._appearance = ""
-        self.init_components(**properties)
+        init_properties(self, properties)
         self.dom_nodes['anvil-m3-iconbutton-container'].addEventListener(
             'click', self._handle_click
         )
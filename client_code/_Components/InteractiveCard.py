@@ -19,12 +19,10 @@ click_event = {
 class InteractiveCard(Card):
     _anvil_properties_ = [enabled_property, *Card._anvil_properties_]
     _anvil_events_ = [click_event, *Card._anvil_events_]
+    _defaulted_props_ = ("enabled",)
 
     def __init__(self, **properties):
         super().__init__(**properties)
-        self.init_components(**properties)
-        # Module component props don't get their default values initialized by default. This makes sure the enabled setter has run.
-        self.enabled = self.enabled
         self.dom_nodes['anvil-m3-card'].classList.toggle('anvil-m3-interactive', True)
         self.dom_nodes['anvil-m3-card'].addEventListener("click", self._handle_click)
 
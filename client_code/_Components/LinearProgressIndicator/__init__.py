@@ -14,7 +14,6 @@ from ._anvil_designer import LinearProgressIndicatorTemplate
 
 class LinearProgressIndicator(LinearProgressIndicatorTemplate):
     def __init__(self, **properties):
-        self._tooltip_node = None
         self.tag = ComponentTag()
         self._props = properties
         self.init_components(**properties)
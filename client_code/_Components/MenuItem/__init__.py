@@ -2,7 +2,9 @@ import anvil.designer
 import anvil.server
 from anvil import *
 from anvil import HtmlTemplate
+from anvil.js import get_dom_node
 
+from ..._utils import BuiltDomNodes, element_from_html
 from ..._utils.properties import (
     anvil_prop,
     bold_property,
@@ -11,24 +13,96 @@ from ..._utils.properties import (
     font_size_property,
     innerText_property,
     italic_property,
+    property_transaction,
     spacing_property,
     tooltip_property,
     underline_property,
 )
 from ._anvil_designer import MenuItemTemplate
 
+# A MenuItem's DOM is cloned rather than parsed from the template's html.
+# MenuItems clone the element built from _ITEM_HTML (as do DropdownMenu's rows);
+# bulk_create's MenuItems clone the DOM of a prototype MenuItem instead.
+_ITEM_HTML = (
+    '<div anvil-name="anvil-m3-menuItem-container" class="anvil-m3-menuItem-container">'
+    '<div anvil-name="anvil-m3-menuItem-leadingIcon" class="anvil-m3-menuItem-aux anvil-m3-menuItem-leadingIcon material-symbols-outlined"></div>'
+    '<div anvil-name="anvil-m3-menuItem-content" class="anvil-m3-menuItem-content">'
+    '<div anvil-name="anvil-m3-menuItem-labelText" class="anvil-m3-menuItem-labelText anvil-m3-menuItem-core"></div>'
+    '<div anvil-name="anvil-m3-menuItem-trailingText" class="anvil-m3-menuItem-trailingText anvil-m3-menuItem-aux"></div>'
+    '<div anvil-name="anvil-m3-menuItem-trailingIcon" class="anvil-m3-menuItem-aux anvil-m3-menuItem-trailingIcon material-symbols-outlined"></div>'
+    '</div>'
+    '</div>'
+)
+_item_prototype = None
+
+# Properties that don't just set the state of the MenuItem's dom_nodes,
+# so bulk_create applies them to each MenuItem rather than cloning them
+_NOT_COPIED = ("tooltip", "visible", "role", "tag")
+
 
-class MenuItem(MenuItemTemplate):
+def _get_item_prototype():
+    global _item_prototype
+    if _item_prototype is None:
+        _item_prototype = element_from_html(_ITEM_HTML)
+    return _item_prototype
+
+
+class MenuItem(BuiltDomNodes, MenuItemTemplate):
     def __init__(self, **properties):
+        self._init_item(_get_item_prototype(), properties, properties)
+
+    def _init_item(self, source, props, properties):
         # Set Form properties and Data Bindings.
         self.tag = ComponentTag()
-        self._props = properties
-        self._tooltip_node = None
-        self.init_components(**properties)
+        self._props = props
+        self._dom_nodes = self._build_dom_nodes(source)
+        with property_transaction():
+            self.init_components(**properties)
         self.dom_nodes['anvil-m3-menuItem-container'].addEventListener(
             "click", self._handle_click
         )
 
+    def _build_dom_nodes(self, source):
+        container = source.cloneNode(True)
+        nodes = {'anvil-m3-menuItem-container': container}
+        for node in container.querySelectorAll('[anvil-name]'):
+            nodes[node.getAttribute('anvil-name')] = node
+        get_dom_node(self).append(container)
+        return nodes
+
+    @classmethod
+    def _from_prototype(cls, prototype, properties):
+        # The shared properties are already applied to the prototype's DOM,
+        # so only this item's own properties go through the setters
+        item = cls.__new__(cls)
+        applied = getattr(prototype, "_applied_props", None)
+        if applied is not None:
+            item._applied_props = dict(applied)
+        item._init_item(
+            prototype.dom_nodes['anvil-m3-menuItem-container'],
+            dict(prototype._props),
+            properties,
+        )
+        return item
+
+    @classmethod
+    def bulk_create(cls, rows, **shared_props):
+        """Create a MenuItem for each row, ready to add to a menu.
+        Each row is a dict of properties (or a string, used as the text) which
+        override shared_props. The shared properties are applied once, to a
+        prototype MenuItem, whose DOM is then cloned for each new MenuItem."""
+        per_item = {}
+        for name in _NOT_COPIED:
+            if name in shared_props:
+                per_item[name] = shared_props.pop(name)
+        prototype = cls(**shared_props)
+        items = []
+        for row in rows:
+            props = dict(per_item)
+            props.update({"text": row} if isinstance(row, str) else row)
+            items.append(cls._from_prototype(prototype, props))
+        return items
+
     italic = italic_property('anvil-m3-menuItem-labelText')
     bold = bold_property('anvil-m3-menuItem-labelText')
     underline = underline_property('anvil-m3-menuItem-labelText')
@@ -154,5 +228,7 @@ class MenuItem(MenuItemTemplate):
 
     #!componentEvent(m3.MenuItem)!1: {name: "click", description: "When the component is clicked.", parameters:[]}
 
+    #!defMethod(_)!2: "Create a MenuItem for each row, sharing the styles in shared_props. Each row is a dict of properties, or a string to use as the text." ["bulk_create"]
+
 
 #!defClass(m3, MenuItem, anvil.Component)!:
@@ -1,11 +1,17 @@
-from anvil.js.window import document
+from bisect import bisect_left, bisect_right
 
-from .._utils import fui, noop
+from anvil.js import get_dom_node
+from anvil.js.window import MutationObserver
+
+from .._utils import events, fui, noop, portal
 from .MenuItem import MenuItem
 import anvil.designer
 
 
 class MenuMixin:
+    # template children (e.g. the menu's button) can be added before __init__ runs
+    _menu_items_stale = True
+
     def __init__(self, component_node, menu_node):
         self._shown = False
         self._component_node = component_node
@@ -13,29 +19,51 @@ class MenuMixin:
         self._open = False
         self._cleanup = noop
         self._hover_index = None
-        self._item_indices = set()
-        self._children = None
+        self._hovered_child = None
+        self._initial_index = None
+        # The components in the menu, and the (sorted) indices of the MenuItems among them.
+        # Built on the first open, then kept up to date as components are added.
+        self._children = []
+        self._item_indices = []
+        self._menu_items_stale = True
+        # Components can leave the menu without going through the menu (remove_from_parent),
+        # so removals are picked up from the DOM
+        self._menu_observer = MutationObserver(self._on_menu_mutation)
+        self._menu_observer.observe(menu_node, {'childList': True})
         self.add_event_handler("x-anvil-page-added", self._menu_mixin_mount)
         self.add_event_handler("x-anvil-page-removed", self._menu_mixin_cleanup)
 
     def _menu_mixin_mount(self, **event_args):
         self._shown = True
         self._menu_node.addEventListener('click', self._handle_child_click)
-        document.addEventListener('click', self._body_click)
-        document.addEventListener('keydown', self._handle_keyboard_events)
-        # We still have a reference to the dom node but we've moved it to the body
-        # This gets around the fact that Anvil containers set their overflow to hidden
-        document.body.append(self._menu_node)
-        self._setup_fui()
+        if self._open:
+            self._subscribe_document_events()
+        # We still have a reference to the dom node but it only lives in the portal
+        # on the body while it's open. This gets around the fact that Anvil
+        # containers set their overflow to hidden
+        if self._open or anvil.designer.in_designer:
+            portal.attach(self._menu_node)
+            self._setup_fui()
+        else:
+            portal.detach(self._menu_node)
 
     def _menu_mixin_cleanup(self, **event_args):
         self._shown = False
         self._menu_node.removeEventListener('click', self._handle_child_click)
-        document.removeEventListener('click', self._body_click)
-        document.removeEventListener('keydown', self._handle_keyboard_events)
+        self._unsubscribe_document_events()
         # Remove the menu node we put on the body
-        self._menu_node.remove()
+        portal.detach(self._menu_node)
         self._cleanup()
+        self._cleanup = noop
+
+    # Document clicks and keys only matter while the menu is open
+    def _subscribe_document_events(self):
+        events.subscribe('click', self._body_click)
+        events.subscribe('keydown', self._handle_keyboard_events)
+
+    def _unsubscribe_document_events(self):
+        events.unsubscribe('click', self._body_click)
+        events.unsubscribe('keydown', self._handle_keyboard_events)
 
     def _setup_fui(self):
         if self._shown:
@@ -76,16 +104,32 @@ class MenuMixin:
 
         self._open = not classes.contains('anvil-m3-buttonMenu-items-hidden')
         if self._open:
+            if self._shown:
+                self._subscribe_document_events()
+                portal.attach(self._menu_node)
             self._setup_fui()
             self._get_hover_index_information()
         else:
+            self._unsubscribe_document_events()
             self._cleanup()
+            self._cleanup = noop
+            if self._shown and not anvil.designer.in_designer:
+                portal.release(self._menu_node)
             self._hover_index = None
             self._clear_hover_styles()
 
     def _handle_keyboard_events(self, event):
         if not self._open:
             return
+        key = event.key
+        if (
+            len(key) == 1
+            and key != " "
+            and not (event.ctrlKey or event.metaKey or event.altKey)
+        ):
+            # jump to the next item starting with the typed character
+            self._jump_to_initial(key)
+            return
         action_keys = set(["ArrowUp", "ArrowDown", "Tab", "Escape", " ", "Enter"])
         if event.key not in action_keys:
             return
@@ -94,6 +138,7 @@ class MenuMixin:
             event.preventDefault()
             return
         # holding value for situations like alerts, where it awaits
+        self._update_menu_index()
         hover = self._hover_index
         self._toggle_visibility(value=False)
 
@@ -117,40 +162,65 @@ class MenuMixin:
             attemptSelect()
 
     def _iterate_hover(self, inc=True):
+        self._update_menu_index()
+        indices = self._item_indices
+        if not indices:
+            return
+        current = self._hover_index
+        # the next (or previous) MenuItem, wrapping round at either end
         if inc:
-            if self._hover_index is None or self._hover_index is (
-                len(self._children) - 1
-            ):
-                self._hover_index = -1
-            while True:
-                self._hover_index += 1
-                if self._hover_index in self._item_indices:
-                    break
+            position = 0 if current is None else bisect_right(indices, current)
+            self._hover_index = (
+                indices[position] if position < len(indices) else indices[0]
+            )
         else:
-            if self._hover_index is None or self._hover_index == 0:
-                self._hover_index = len(self._children)
-            while True:
-                self._hover_index -= 1
-                if self._hover_index in self._item_indices:
-                    break
+            position = (
+                len(indices) if current is None else bisect_left(indices, current)
+            )
+            self._hover_index = indices[position - 1] if position else indices[-1]
         self._children[self._hover_index].dom_nodes[
             'anvil-m3-menuItem-container'
         ].scrollIntoView({'block': 'nearest'})
         self._update_hover_styles()
 
-    def _update_hover_styles(self):
-        self._clear_hover_styles()
+    def _jump_to_initial(self, char):
+        self._update_menu_index()
+        if self._initial_index is None:
+            initial_index = self._initial_index = {}
+            for index in self._item_indices:
+                text = self._children[index].text
+                if text:
+                    initial_index.setdefault(text[0].lower(), []).append(index)
+        indices = self._initial_index.get(char.lower())
+        if not indices:
+            return
+        current = -1 if self._hover_index is None else self._hover_index
+        # the first match after the hovered item, wrapping round to the start
+        position = bisect_right(indices, current)
+        self._hover_index = indices[position] if position < len(indices) else indices[0]
         self._children[self._hover_index].dom_nodes[
             'anvil-m3-menuItem-container'
-        ].classList.toggle('anvil-m3-menuItem-container-keyboardHover', True)
+        ].scrollIntoView({'block': 'nearest'})
+        self._update_hover_styles()
+
+    def _update_hover_styles(self):
+        self._set_hovered_child(self._children[self._hover_index])
 
     def _clear_hover_styles(self):
-        if self._children is not None:
-            for child in self._children:
-                if isinstance(child, MenuItem):
-                    child.dom_nodes['anvil-m3-menuItem-container'].classList.toggle(
-                        'anvil-m3-menuItem-container-keyboardHover', False
-                    )
+        self._set_hovered_child(None)
+
+    def _set_hovered_child(self, child):
+        # Only the previously hovered item and the newly hovered item are touched
+        old = self._hovered_child
+        if old is not None and old is not child:
+            old.dom_nodes['anvil-m3-menuItem-container'].classList.toggle(
+                'anvil-m3-menuItem-container-keyboardHover', False
+            )
+        if child is not None:
+            child.dom_nodes['anvil-m3-menuItem-container'].classList.toggle(
+                'anvil-m3-menuItem-container-keyboardHover', True
+            )
+        self._hovered_child = child
 
     def _body_click(self, event):
         if self._component_node.contains(event.target) or self._menu_node.contains(
@@ -160,7 +230,44 @@ class MenuMixin:
         self._toggle_visibility(value=False)
 
     def _get_hover_index_information(self):
-        self._children = self.get_components()[:-1]
-        for i in range(0, len(self._children)):
-            if isinstance(self._children[i], MenuItem):
-                self._item_indices.add(i)
+        # item text may have changed since the menu was last open
+        self._initial_index = None
+        self._update_menu_index()
+
+    def _update_menu_index(self):
+        if not self._menu_items_stale:
+            return
+        self._menu_items_stale = False
+        self._initial_index = None
+        menu_node = self._menu_node
+        self._children = [
+            c for c in self.get_components() if menu_node.contains(get_dom_node(c))
+        ]
+        self._item_indices = [
+            i for i, c in enumerate(self._children) if isinstance(c, MenuItem)
+        ]
+
+    def _on_menu_mutation(self, records, *args):
+        for record in records:
+            if record.removedNodes.length:
+                self._menu_items_stale = True
+                self._initial_index = None
+                self._hover_index = None
+                self._clear_hover_styles()
+                return
+
+    def add_component(self, component, **kwargs):
+        super().add_component(component, **kwargs)
+        if self._menu_items_stale:
+            return
+        if not self._menu_node.contains(get_dom_node(component)):
+            # e.g. the menu's own button
+            return
+        if kwargs.get("index") is not None:
+            # inserting shifts the positions of the components after it
+            self._menu_items_stale = True
+            return
+        if isinstance(component, MenuItem):
+            self._item_indices.append(len(self._children))
+        self._children.append(component)
+        self._initial_index = None
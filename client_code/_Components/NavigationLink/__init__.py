@@ -25,7 +25,6 @@ class NavigationLink(NavigationLinkTemplate):
     def __init__(self, **properties):
         self.tag = ComponentTag()
         self._props = properties
-        self._tooltip_node = None
         # Set Form properties and Data Bindings.
         self.init_components(**properties)
         self.dom_nodes['anvil-m3-navigation-link'].addEventListener(
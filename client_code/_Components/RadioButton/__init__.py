@@ -29,7 +29,6 @@ class RadioButton(RadioButtonTemplate):
     def __init__(self, **properties):
         self.tag = ComponentTag()
         self._props = properties
-        self._tooltip_node = None
         self._group = None
         self._group_set_from_code = False
         self._set_designer_text_placeholder, self._start_inline_editing = (
@@ -1,9 +1,12 @@
+import math
+
 import anvil.js
 from anvil import *
 from anvil import HtmlTemplate
 from anvil.designer import in_designer
-from anvil.js.window import ResizeObserver, document
+from anvil.js.window import document, requestAnimationFrame
 
+from ..._utils import resize
 from ..._utils.properties import (
     anvil_prop,
     color_property,
@@ -16,6 +19,9 @@ from ..._utils.properties import (
 )
 from ._anvil_designer import SliderTemplate
 
+# Markers are 4px wide, so closer than this they run into each other
+_MIN_MARKER_SPACING = 8
+
 
 class Slider(SliderTemplate):
     def __init__(self, **properties):
@@ -26,15 +32,27 @@ class Slider(SliderTemplate):
         self.label.classList.add('anvil-m3-slider-label')
         self.label_container.appendChild(self.label)
         self._props = properties
-        self._tooltip_node = None
         self._mounted = False
+        self._label_shown = False
+        self._update_pending = False
+        # Where the track is on the page, measured when a drag starts
+        self._track_left = 0
+        self._track_top = 0
+        self._track_width = 0
+        self._on_window_resize = self._on_window_resize
         self.init_components(**properties)
 
         self.dom_nodes["anvil-m3-slider-input"].addEventListener(
             "input", self._on_input
         )
         self.dom_nodes["anvil-m3-slider-input"].addEventListener(
-            "mousedown", self._on_mouse_down
+            "pointerdown", self._on_pointer_down
+        )
+        self.dom_nodes["anvil-m3-slider-input"].addEventListener(
+            "pointerup", self._on_pointer_up
+        )
+        self.dom_nodes["anvil-m3-slider-input"].addEventListener(
+            "pointercancel", self._on_pointer_up
         )
         self.dom_nodes['anvil-m3-slider-input'].addEventListener(
             "change", self._on_change
@@ -43,17 +61,13 @@ class Slider(SliderTemplate):
         self.add_event_handler("x-anvil-page-removed", self._on_cleanup)
 
     def _on_mount(self, **event_args):
-        self.resize_observer = ResizeObserver(self._on_window_resize)
-        self.resize_observer.observe(self.dom_nodes['anvil-m3-slider'])
+        resize.observe(self.dom_nodes['anvil-m3-slider'], self._on_window_resize)
         self._mounted = True
-        self._set_markers()
-        self.dom_nodes[
-            'anvil-m3-slider-track-container'
-        ].style.width = self._get_track_width()
+        self._set_track_width(self._get_track_width())
         self._update_progress()
 
     def _on_cleanup(self, **event_args):
-        self.resize_observer.unobserve(self.dom_nodes['anvil-m3-slider'])
+        resize.unobserve(self.dom_nodes['anvil-m3-slider'], self._on_window_resize)
         self._mounted = False
 
     def _anvil_get_unset_property_values_(self):
@@ -62,27 +76,44 @@ class Slider(SliderTemplate):
         return {"margin": m}
 
     def _on_change(self, event):
+        # make sure the last change is raised before change_end
+        if self._update_pending:
+            self._run_update()
         self.raise_event("change_end")
 
     def _on_input(self, event):
+        # A drag fires input far more often than the screen refreshes,
+        # so the progress bar, label and change event are updated once per frame
+        if not self._update_pending:
+            self._update_pending = True
+            requestAnimationFrame(self._run_update)
+
+    def _run_update(self, *args):
+        if not self._update_pending:
+            return
+        self._update_pending = False
         self._update_progress()
         self.raise_event("change")
 
-    def _on_mouse_down(self, event):
+    def _on_pointer_down(self, event):
+        # with pointer capture, pointerup comes back to the input wherever it happens
+        event.target.setPointerCapture(event.pointerId)
         self._do_show_label()
-        document.addEventListener("mouseup", self._on_mouse_up)
 
-    def _on_mouse_up(self, event):
+    def _on_pointer_up(self, event):
         self._do_hide_label()
-        document.removeEventListener("mouseup", self._on_mouse_up)
 
-    def _on_window_resize(self, *args):
-        self.dom_nodes[
-            'anvil-m3-slider-track-container'
-        ].style.width = self._get_track_width()
-        self._set_markers()
+    def _on_window_resize(self, entry):
+        if self._label_shown:
+            self._measure_track()
+        self._set_track_width(entry.contentRect.width - 4)
         self._update_progress()
 
+    def _set_track_width(self, width):
+        self._track_width = width
+        self.dom_nodes['anvil-m3-slider-track-container'].style.width = f"{width}px"
+        self._set_markers()
+
     def _update_progress(self):
         slider = self.dom_nodes["anvil-m3-slider-input"]
         progress = self.dom_nodes["anvil-m3-slider-progress"]
@@ -92,60 +123,71 @@ class Slider(SliderTemplate):
         percent = (abs_value / range) * 100
         progress.style.width = f"max(calc({percent}% - 6px), 0px)"
         background.style.width = f"max(calc({100 - percent}% - 6px), 0px)"
-        progress_right, progress_top = self._check_position()
         self.label.textContent = slider.value
-        self.label_container.style.left = str(progress_right) + "px"
-        self.label_container.style.top = str(progress_top) + "px"
+        if self._label_shown:
+            self._position_label(percent)
         if slider.value == slider.min:
             self.label_container.style.marginLeft = '-25px'
         else:
             self.label_container.style.marginLeft = '-18px'
 
+    def _position_label(self, percent):
+        # the right edge of the progress bar, worked out from the measured track
+        # rather than read back from the page after its width was just written
+        progress_right = self._track_left + max(
+            percent * self._track_width / 100 - 6, 0
+        )
+        self.label_container.style.left = f"{progress_right}px"
+        self.label_container.style.top = f"{self._track_top}px"
+
     def _get_track_width(self):
         input = self.dom_nodes["anvil-m3-slider-input"]
         input_width = input.getBoundingClientRect().width
-        return str(input_width - 4) + "px"
+        return input_width - 4
 
-    def _check_position(self):
-        progress_rect = self.dom_nodes[
-            "anvil-m3-slider-progress"
+    def _measure_track(self):
+        track_rect = self.dom_nodes[
+            "anvil-m3-slider-track-container"
         ].getBoundingClientRect()
-        progress_right = progress_rect.right
-        progress_top = progress_rect.top
-        return progress_right, progress_top
+        self._track_left = track_rect.left
+        self._track_top = track_rect.top
+        self._track_width = track_rect.width
 
     def _do_show_label(self):
         if self.show_label:
-            self.label_container.remove()
+            self._measure_track()
+            self._label_shown = True
             document.body.appendChild(self.label_container)
             self._update_progress()
 
     def _do_hide_label(self):
+        self._label_shown = False
         self.label_container.remove()
 
     def _set_markers(self):
+        # The markers are a repeating gradient on the two marker containers,
+        # so their cost doesn't depend on how many steps the slider has
+        full_slider = self.dom_nodes["anvil-m3-slider"]
+        if not self.show_markers:
+            full_slider.classList.remove("anvil-m3-slider-show-markers")
+            return
         slider = self.dom_nodes["anvil-m3-slider-input"]
-        markers_container_bg = self.dom_nodes["anvil-m3-slider-markers-container-bg"]
-        markers_container_progress = self.dom_nodes[
-            "anvil-m3-slider-markers-container-progress"
-        ]
-        markers_container_bg.innerHTML = ''
-        markers_container_progress.innerHTML = ''
-        markers_container_bg.style.width = self._get_track_width()
-        markers_container_progress.style.width = self._get_track_width()
         slider_range = float(slider.max) - float(slider.min)
         if slider.step != 'null':
             marker_count = int(slider_range // float(slider.step))
         else:
             marker_count = slider_range
-        if self.show_markers:
-            for i in range(marker_count + 1):
-                marker_bg = document.createElement('span')
-                marker_progress = document.createElement('span')
-                marker_bg.classList.add('anvil-m3-slider-marker-bg')
-                marker_progress.classList.add('anvil-m3-slider-marker-progress')
-                markers_container_bg.appendChild(marker_bg)
-                markers_container_progress.appendChild(marker_progress)
+        spacing = (self._track_width - 4) / max(marker_count, 1)
+        if 0 < spacing < _MIN_MARKER_SPACING:
+            # more steps than there is room for, so only mark every nth step
+            spacing *= math.ceil(_MIN_MARKER_SPACING / spacing)
+        full_slider.style.setProperty(
+            "--anvil-m3-slider-track-width", f"{self._track_width}px"
+        )
+        full_slider.style.setProperty(
+            "--anvil-m3-slider-marker-spacing", f"{spacing}px"
+        )
+        full_slider.classList.add("anvil-m3-slider-show-markers")
 
     #!componentProp(m3.Slider)!1: {name:"show_label",type:"boolean",description:"If True, display a label above the thumb with the current value."}
     #!componentProp(m3.Slider)!1: {name:"progress_color",type:"color",description:"The colour of the progress bar"}
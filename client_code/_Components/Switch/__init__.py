@@ -9,9 +9,9 @@ from ..._utils.properties import (
     get_unset_margin,
     margin_property,
     property_with_callback,
+    resolve_many,
     role_property,
     style_property,
-    theme_color_to_css,
     tooltip_property,
 )
 from ._anvil_designer import SwitchTemplate
@@ -21,7 +21,6 @@ class Switch(SwitchTemplate):
     def __init__(self, **properties):
         # Set Form properties and Data Bindings.
         self.tag = ComponentTag()
-        self._tooltip_node = None
         self._props = properties
         self.init_components(**properties)
         self.dom_nodes['anvil-m3-switch-input'].addEventListener(
@@ -53,41 +52,30 @@ class Switch(SwitchTemplate):
             self.raise_event("change")
 
     def _set_color_styles(self, value=None):
+        slider = self.dom_nodes['anvil-m3-switch-slider']
         if self.selected:
-            self.dom_nodes['anvil-m3-switch-slider'].style.backgroundColor = (
-                theme_color_to_css(self.selected_background_color)
-                if self.selected_background_color
-                else None
+            background_color, thumb_color = resolve_many(
+                [self.selected_background_color, self.selected_thumb_color]
+            )
+            slider.style.backgroundColor = background_color or None
+            slider.style.setProperty(
+                '--anvil-m3-selected-thumb-color',
+                thumb_color or 'var(--anvil-m3-on-primary)',
             )
-            if self.selected_thumb_color:
-                self.dom_nodes['anvil-m3-switch-slider'].style.setProperty(
-                    '--anvil-m3-selected-thumb-color',
-                    theme_color_to_css(self.selected_thumb_color),
-                )
-            else:
-                self.dom_nodes['anvil-m3-switch-slider'].style.setProperty(
-                    '--anvil-m3-selected-thumb-color', 'var(--anvil-m3-on-primary)'
-                )
         else:
-            self.dom_nodes['anvil-m3-switch-slider'].style.backgroundColor = (
-                theme_color_to_css(self.unselected_background_color)
-                if self.unselected_background_color
-                else None
+            background_color, outline_color, thumb_color = resolve_many(
+                [
+                    self.unselected_background_color,
+                    self.unselected_outline_color,
+                    self.unselected_thumb_color,
+                ]
             )
-            self.dom_nodes['anvil-m3-switch-slider'].style.borderColor = (
-                theme_color_to_css(self.unselected_outline_color)
-                if self.unselected_outline_color
-                else None
+            slider.style.backgroundColor = background_color or None
+            slider.style.borderColor = outline_color or None
+            slider.style.setProperty(
+                '--anvil-m3-unselected-thumb-color',
+                thumb_color or 'var(--anvil-m3-outline)',
             )
-            if self.unselected_thumb_color:
-                self.dom_nodes['anvil-m3-switch-slider'].style.setProperty(
-                    '--anvil-m3-unselected-thumb-color',
-                    theme_color_to_css(self.unselected_thumb_color),
-                )
-            else:
-                self.dom_nodes['anvil-m3-switch-slider'].style.setProperty(
-                    '--anvil-m3-unselected-thumb-color', 'var(--anvil-m3-outline)'
-                )
 
     #!componentEvent(m3.Switch)!1: {name: "change", description: "When the state of the Switch is changed."}
     #!componentEvent(m3.Switch)!1: {name: "show", description: "When the Switch is shown on the screen."}
@@ -25,7 +25,6 @@ class Text(TextTemplate):
         # Set Form properties and Data Bindings.
         self.tag = anvil.ComponentTag()
         self._props = properties
-        self._tooltip_node = None
         self._set_designer_text_placeholder, self._start_inline_editing = (
             inline_editing(self, self.dom_nodes['anvil-m3-text'], self._set_text)
         )
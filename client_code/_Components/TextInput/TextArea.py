@@ -1,8 +1,9 @@
 import anvil.designer
 import anvil.js
 import anvil.server
-from anvil.js.window import ResizeObserver, requestAnimationFrame
+from anvil.js.window import CSS, requestAnimationFrame
 
+from ..._utils import resize
 from ..._utils.properties import (
     anvil_prop,
     bold_property,
@@ -25,6 +26,12 @@ text_property = {
     "important": True,
 }
 
+# Min-height based off M3 specs
+_MIN_HEIGHT = 56
+
+# Where the browser supports it, the textarea grows with its content by itself
+_FIELD_SIZING = bool(CSS.supports("field-sizing", "content"))
+
 height_property = {
     "name": "height",
     "type": "number",
@@ -35,36 +42,43 @@ height_property = {
 
 class TextArea(TextInput):
     _anvil_properties_ = [text_property, height_property, *TextInput._anvil_properties_]
+    _defaulted_props_ = (
+        "display_italic",
+        "display_bold",
+        "display_underline",
+        "display_font_size",
+        "display_font",
+        "display_text_color",
+        "background_color",
+        "align",
+        "placeholder",
+        "label",
+        "text",
+        "enabled",
+        "height",
+        "character_limit",
+    )
+    _field_name_ = "anvil-m3-textarea"
+    _field_html_ = '<textarea class="anvil-m3-textinput-input anvil-m3-textarea" row="1"></textarea>'
+    _fit_pending = False
+    _border_height = None
 
     def __init__(self, **properties):
         super().__init__(**properties)
-        self.init_components(**properties)
-
-        self.display_italic = self.display_italic
-        self.display_bold = self.display_bold
-        self.display_underline = self.display_underline
-        self.display_font_size = self.display_font_size
-        self.display_font = self.display_font
-        self.display_text_color = self.display_text_color
-        self.background_color = self.background_color
-        self.align = self.align
-        self.placeholder = self.placeholder
-        self.label = self.label
-        self.text = self.text
-        self.enabled = self.enabled
-        self.height = self.height
-        self.character_limit = self.character_limit
-
-        hiddenInput = self.dom_nodes['anvil-m3-textbox']
-        self.dom_nodes['anvil-m3-input-container'].removeChild(hiddenInput)
 
         self._on_change = self._on_change
         self._on_focus = self._on_focus
         self._on_lost_focus = self._on_lost_focus
+        self._on_resize = self._on_resize
 
-        self.dom_nodes['anvil-m3-textarea'].addEventListener(
-            "input", self._expand_to_fit_content
-        )
+        if _FIELD_SIZING:
+            self.dom_nodes['anvil-m3-textarea'].style.setProperty(
+                "field-sizing", "content"
+            )
+        else:
+            self.dom_nodes['anvil-m3-textarea'].addEventListener(
+                "input", self._schedule_fit
+            )
         self.dom_nodes['anvil-m3-textarea'].addEventListener("input", self._on_input)
         self.dom_nodes['anvil-m3-textarea'].addEventListener("change", self._on_change)
         self.dom_nodes['anvil-m3-textarea'].addEventListener("focus", self._on_focus)
@@ -76,11 +90,10 @@ class TextArea(TextInput):
         self.add_event_handler("x-anvil-page-removed", self._on_cleanup)
 
     def _on_mount(self, **event_args):
-        self.resize_observer = ResizeObserver(self._on_resize)
-        self.resize_observer.observe(self.dom_nodes['anvil-m3-textarea'])
+        resize.observe(self.dom_nodes['anvil-m3-textarea'], self._on_resize)
 
     def _on_cleanup(self, **event_args):
-        self.resize_observer.unobserve(self.dom_nodes['anvil-m3-textarea'])
+        resize.unobserve(self.dom_nodes['anvil-m3-textarea'], self._on_resize)
 
     def _anvil_get_unset_property_values_(self):
         common_props = TextInput._get_common_unset_property_values_(self)
@@ -89,24 +102,39 @@ class TextArea(TextInput):
         )
         return common_props
 
-    def _expand_to_fit_content(self, event):
-        if event.target.scrollHeight > event.target.clientHeight:
-            self.dom_nodes[
-                'anvil-m3-textarea'
-            ].style.height = '56px'  # Min-height based off M3 specs
-            self._set_height(event.target.scrollHeight)
-
-    def _on_resize(self, entries, observer):
-        for entry in entries:
-            h = entry.target.scrollHeight
-        requestAnimationFrame(lambda _: self._set_height(h))
+    def _on_resize(self, entry):
+        self._schedule_fit()
+
+    def _schedule_fit(self, *args):
+        # Fitting to the content happens at most once per frame, however many
+        # input or resize events there were
+        if not self._fit_pending:
+            self._fit_pending = True
+            requestAnimationFrame(self._fit_to_content)
+
+    def _fit_to_content(self, *args):
+        self._fit_pending = False
+        textarea = self.dom_nodes['anvil-m3-textarea']
+        # Read everything first...
+        scroll_height = textarea.scrollHeight
+        height = textarea.clientHeight
+        # ...then write, so layout is only computed once
+        if not _FIELD_SIZING and scroll_height > height:
+            height = scroll_height
+            textarea.style.height = f'{height}px'
+        if height != self._border_height:
+            self._border_height = height
+            self.dom_nodes['anvil-m3-border-container'].style.height = f"{height}px"
 
     def _set_height(self, h):
-        # Keep this function, because it's easier to call it from a lambda than setting the height property.
-        self.dom_nodes['anvil-m3-textarea'].style.height = f'{h}px'
-        self.dom_nodes[
-            'anvil-m3-border-container'
-        ].style.height = f"{self.dom_nodes['anvil-m3-textarea'].clientHeight}px"
+        textarea = self.dom_nodes['anvil-m3-textarea']
+        if _FIELD_SIZING:
+            # an explicit height would stop the textarea growing with its content
+            textarea.style.minHeight = f'{max(h or 0, _MIN_HEIGHT)}px'
+        else:
+            textarea.style.height = f'{h}px'
+        # the border is resized to match on the next frame
+        self._schedule_fit()
 
     def _set_id(self, value):
         super()._set_id(value)
@@ -251,6 +279,7 @@ class TextArea(TextInput):
     #!componentProp(m3.TextArea)!1: {name:"display_bold",type:"boolean",description:"If True, the input and placeholder text will be bold."}
 
     #!componentProp(m3.TextArea)!1: {name:"supporting_text",type:"string",description:"The supporting text displayed underneath this component"}
+    #!componentProp(m3.TextArea)!1: {name:"change_debounce",type:"number",description:"The delay (milliseconds) after the last keystroke before the change event is raised. 0 raises it on every keystroke. Set to 'frame' in code to raise it at most once per animation frame."}
     #!componentProp(m3.TextArea)!1: {name:"character_limit",type:"number",description:"The max number of characters a user can enter into this component. The limit is displayed below the component."}
     #!componentProp(m3.TextArea)!1: {name:"subcontent_color",type:"color",description:"The colour of the supporting text and the character limit underneath this component."}
     #!componentProp(m3.TextArea)!1: {name:"subcontent_font_family",type:"color",description:"The font family to use for the supporting text and the character limit underneath this component."}
@@ -103,32 +103,34 @@ class TextBox(TextInput):
         *TextInput._anvil_properties_,
     ]
     _anvil_events_ = [click_event, pressed_enter_event, *TextInput._anvil_events_]
+    _defaulted_props_ = (
+        "display_italic",
+        "display_bold",
+        "display_underline",
+        "display_font_size",
+        "display_font_family",
+        "display_text_color",
+        "background_color",
+        "leading_icon_color",
+        "trailing_icon_color",
+        "placeholder",
+        "text",
+        "label",
+        "enabled",
+        "error",
+        "leading_icon",
+        "character_limit",
+        "type",
+        "hide_text",
+    )
+    _reapplied_props_ = ("error", "type", "hide_text")
+    _field_name_ = "anvil-m3-textbox"
+    _field_html_ = (
+        '<input class="anvil-m3-textinput-input anvil-m3-textbox" type="text" />'
+    )
 
     def __init__(self, **properties):
         super().__init__(**properties)
-        self.init_components(**properties)
-
-        self.display_italic = self.display_italic
-        self.display_bold = self.display_bold
-        self.display_underline = self.display_underline
-        self.display_font_size = self.display_font_size
-        self.display_font_family = self.display_font_family
-        self.display_text_color = self.display_text_color
-        self.background_color = self.background_color
-        self.leading_icon_color = self.leading_icon_color
-        self.trailing_icon_color = self.trailing_icon_color
-        self.placeholder = self.placeholder
-        self.text = self.text
-        self.label = self.label
-        self.enabled = self.enabled
-        self.error = self.error
-        self.leading_icon = self.leading_icon
-        self.character_limit = self.character_limit
-        self.type = self.type
-        self.hide_text = self.hide_text
-
-        hiddenInput = self.dom_nodes['anvil-m3-textarea']
-        self.dom_nodes['anvil-m3-input-container'].removeChild(hiddenInput)
 
         self._on_key_down = self._on_key_down
         self._on_change = self._on_change
@@ -149,7 +151,7 @@ class TextBox(TextInput):
 
     def _on_key_down(self, e):
         if getattr(e, 'key', None) == "Enter":
-            self.raise_event("x-anvil-write-back-text")
+            self._write_back()
             self.raise_event("pressed_enter")
 
     def _handle_click(self, event):
@@ -371,6 +373,7 @@ class TextBox(TextInput):
     #!componentProp(m3.TextBox)!1: {name:"trailing_icon_color",type:"color",description:"The colour of the trailing icon displayed on this component."}
 
     #!componentProp(m3.TextBox)!1: {name:"supporting_text",type:"string",description:"The supporting text displayed below this component"}
+    #!componentProp(m3.TextBox)!1: {name:"change_debounce",type:"number",description:"The delay (milliseconds) after the last keystroke before the change event is raised. 0 raises it on every keystroke. Set to 'frame' in code to raise it at most once per animation frame."}
     #!componentProp(m3.TextBox)!1: {name:"character_limit",type:"number",description:"The max number of characters a user can enter into this component. The limit is displayed below the component."}
     #!componentProp(m3.TextBox)!1: {name:"subcontent_color",type:"color",description:"The colour of the supporting text and the character limit below this component."}
     #!componentProp(m3.TextBox)!1: {name:"subcontent_font_family",type:"color",description:"The font family to use for the supporting text and the character limit below this component."}
@@ -1,8 +1,9 @@
 import anvil.server
 from anvil import *
 from anvil import HtmlTemplate
+from anvil.js.window import clearTimeout, requestAnimationFrame, setTimeout
 
-from ..._utils import gen_id
+from ..._utils import BuiltDomNodes, element_from_html, gen_id
 from ..._utils.properties import (
     anvil_prop,
     bold_property,
@@ -11,10 +12,12 @@ from ..._utils.properties import (
     font_size_property,
     get_unset_margin,
     get_unset_value,
+    init_properties,
     innerText_property,
     italic_property,
     margin_property,
     property_with_callback,
+    simple_prop,
     theme_color_to_css,
     tooltip_property,
     underline_property,
@@ -23,15 +26,38 @@ from ..._utils.properties import (
 from ._anvil_designer import TextInputTemplate
 
 
-class TextInput(TextInputTemplate):
+# Prototype field elements, cloned for each new TextBox/TextArea
+_field_prototypes = {}
+
+
+class TextInput(BuiltDomNodes, TextInputTemplate):
+    # The template has no field element. Each variant adds its own <input> or
+    # <textarea>, under this name in dom_nodes, so no unused element is created.
+    _field_name_ = None
+    _field_html_ = None
+
     def __init__(self, **properties):
         self.tag = ComponentTag()
         self._props = properties
-        self._tooltip_node = None
-        self.init_components(**properties)
+        self._counter_pending = False
+        self._change_pending = False
+        self._change_timer = None
+        self._dom_nodes = self._build_dom_nodes()
+        init_properties(self, properties)
 
         self._on_input = self._on_input
 
+    def _build_dom_nodes(self):
+        nodes = dict(super().dom_nodes)
+        name = self._field_name_
+        if name is not None:
+            prototype = _field_prototypes.get(name)
+            if prototype is None:
+                prototype = _field_prototypes[name] = element_from_html(self._field_html_)
+            field = nodes[name] = prototype.cloneNode(True)
+            nodes['anvil-m3-input-container'].prepend(field)
+        return nodes
+
     def _get_common_unset_property_values_(self):
         el = self.dom_nodes['anvil-m3-textinput']
         m = get_unset_margin(el, self.margin)
@@ -55,13 +81,46 @@ class TextInput(TextInputTemplate):
         self.dom_nodes["anvil-m3-character-amount"].setAttribute("for", value)
 
     def _on_input(self, e):
-        self.dom_nodes['anvil-m3-character-amount'].innerText = len(e.target.value)
+        # The character count is written at most once per frame
+        if not self._counter_pending:
+            self._counter_pending = True
+            requestAnimationFrame(self._update_character_amount)
+
         # input event is anvil's change event
-        self.raise_event("change")
+        debounce = self.change_debounce
+        if not debounce:
+            self.raise_event("change")
+        elif debounce == "frame":
+            if not self._change_pending:
+                self._change_pending = True
+                requestAnimationFrame(self._raise_pending_change)
+        else:
+            self._change_pending = True
+            if self._change_timer is not None:
+                clearTimeout(self._change_timer)
+            self._change_timer = setTimeout(self._raise_pending_change, debounce)
+
+    def _update_character_amount(self, *args):
+        self._counter_pending = False
+        field = self.dom_nodes[self._field_name_]
+        self.dom_nodes['anvil-m3-character-amount'].innerText = len(field.value)
+
+    def _raise_pending_change(self, *args):
+        if self._change_timer is not None:
+            clearTimeout(self._change_timer)
+            self._change_timer = None
+        if self._change_pending:
+            self._change_pending = False
+            self.raise_event("change")
+
+    def _write_back(self):
+        # a debounced change event is raised before the text is written back
+        self._raise_pending_change()
+        self.raise_event("x-anvil-write-back-text")
 
     def _on_change(self, e):
         # On text input/textarea the change event fires when we lose focus
-        self.raise_event("x-anvil-write-back-text")
+        self._write_back()
 
     def _on_focus(self, e):
         self.raise_event("focus")
@@ -93,6 +152,7 @@ class TextInput(TextInputTemplate):
     label_font_family = font_family_property('anvil-m3-label-text', 'label_font_family')
     label_color = color_property('anvil-m3-label-text', 'color', 'label_color')
     margin = margin_property('anvil-m3-textinput')
+    change_debounce = simple_prop('change_debounce')
     tooltip = tooltip_property('anvil-m3-textinput')
     subcontent_color = color_property('anvil-m3-subcontent', 'color', 'subcontent_color')
     subcontent_font_family = font_family_property('anvil-m3-subcontent', 'subcontent_font_family')
@@ -131,44 +191,30 @@ class TextInput(TextInputTemplate):
     @anvil_prop
     @property
     def border_color(self, value):
+        style = self.dom_nodes["anvil-m3-textinput"].style
         if self.border_color:
-            self.dom_nodes["anvil-m3-textinput"].style.setProperty(
-                '--anvil-m3-outlined-border', theme_color_to_css(self.border_color)
-            )
-            self.dom_nodes["anvil-m3-textinput"].style.setProperty(
-                '--anvil-m3-outlined-border-hover',
-                theme_color_to_css(self.border_color),
-            )
-            self.dom_nodes["anvil-m3-textinput"].style.setProperty(
-                '--anvil-m3-outlined-border-focus',
-                theme_color_to_css(self.border_color),
-            )
-            self.dom_nodes["anvil-m3-textinput"].style.setProperty(
-                '--anvil-m3-filled-border', theme_color_to_css(self.border_color)
-            )
-            self.dom_nodes["anvil-m3-textinput"].style.setProperty(
-                '--anvil-m3-filled-border-hover', theme_color_to_css(self.border_color)
-            )
-            self.dom_nodes["anvil-m3-textinput"].style.setProperty(
-                '--anvil-m3-filled-border-focus', theme_color_to_css(self.border_color)
-            )
+            color = theme_color_to_css(self.border_color)
+            style.setProperty('--anvil-m3-outlined-border', color)
+            style.setProperty('--anvil-m3-outlined-border-hover', color)
+            style.setProperty('--anvil-m3-outlined-border-focus', color)
+            style.setProperty('--anvil-m3-filled-border', color)
+            style.setProperty('--anvil-m3-filled-border-hover', color)
+            style.setProperty('--anvil-m3-filled-border-focus', color)
         else:
-            self.dom_nodes["anvil-m3-textinput"].style.setProperty(
-                '--anvil-m3-outlined-border', 'var(--anvil-m3-outline)'
-            )
-            self.dom_nodes["anvil-m3-textinput"].style.setProperty(
+            style.setProperty('--anvil-m3-outlined-border', 'var(--anvil-m3-outline)')
+            style.setProperty(
                 '--anvil-m3-outlined-border-hover', 'var(--anvil-m3-on-surface)'
             )
-            self.dom_nodes["anvil-m3-textinput"].style.setProperty(
+            style.setProperty(
                 '--anvil-m3-outlined-border-focus', 'var(--anvil-m3-primary)'
             )
-            self.dom_nodes["anvil-m3-textinput"].style.setProperty(
+            style.setProperty(
                 '--anvil-m3-filled-border', 'var(--anvil-m3-on-surface-variant)'
             )
-            self.dom_nodes["anvil-m3-textinput"].style.setProperty(
+            style.setProperty(
                 '--anvil-m3-filled-border-hover', 'var(--anvil-m3-on-surface)'
             )
-            self.dom_nodes["anvil-m3-textinput"].style.setProperty(
+            style.setProperty(
                 '--anvil-m3-filled-border-focus', 'var(--anvil-m3-primary)'
             )
 
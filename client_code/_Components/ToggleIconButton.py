@@ -1,7 +1,7 @@
 import anvil.designer
 import anvil.server
 
-from .._utils.properties import property_with_callback, theme_color_to_css
+from .._utils.properties import property_with_callback, resolve_many
 from .IconButton import IconButton
 
 selected_property = {
@@ -48,18 +48,18 @@ class ToggleIconButton(IconButton):
         selected_icon_color_property,
         *IconButton._anvil_properties_,
     ]
+    _defaulted_props_ = (
+        "border",
+        "icon_color",
+        "background_color",
+        "selected_border",
+        "selected_background_color",
+        "selected_icon_color",
+        "selected",
+    )
 
     def __init__(self, **properties):
         super().__init__(**properties)
-        self.init_components(**properties)
-
-        self.border = self.border
-        self.icon_color = self.icon_color
-        self.background_color = self.background_color
-        self.selected_border = self.selected_border
-        self.selected_background_color = self.selected_background_color
-        self.selected_icon_color = self.selected_icon_color
-        self.selected = self.selected
 
         self.dom_nodes['anvil-m3-iconbutton-container'].classList.toggle(
             "anvil-m3-toggle", True
@@ -86,30 +86,21 @@ class ToggleIconButton(IconButton):
         ]
 
     def _apply_styles(self, value):
+        container = self.dom_nodes['anvil-m3-iconbutton-container']
+        icon = self.dom_nodes['anvil-m3-iconbutton-icon']
         if value:
-            self.dom_nodes['anvil-m3-iconbutton-container'].style.backgroundColor = (
-                theme_color_to_css(self.selected_background_color)
-                if self.selected_background_color
-                else None
-            )
-            self.dom_nodes[
-                'anvil-m3-iconbutton-container'
-            ].style.border = self.selected_border
-            self.dom_nodes['anvil-m3-iconbutton-icon'].style.color = (
-                theme_color_to_css(self.selected_icon_color)
-                if self.selected_icon_color
-                else None
+            background_color, icon_color = resolve_many(
+                [self.selected_background_color, self.selected_icon_color]
             )
+            border = self.selected_border
         else:
-            self.dom_nodes['anvil-m3-iconbutton-container'].style.backgroundColor = (
-                theme_color_to_css(self.background_color)
-                if self.background_color
-                else None
-            )
-            self.dom_nodes['anvil-m3-iconbutton-container'].style.border = self.border
-            self.dom_nodes['anvil-m3-iconbutton-icon'].style.color = (
-                theme_color_to_css(self.icon_color) if self.icon_color else None
+            background_color, icon_color = resolve_many(
+                [self.background_color, self.icon_color]
             )
+            border = self.border
+        container.style.backgroundColor = background_color or None
+        container.style.border = border
+        icon.style.color = icon_color or None
 
     def _selected_setter(self, value):
         self.dom_nodes['anvil-m3-iconbutton-container'].classList.toggle(
@@ -1,3 +1,5 @@
+from anvil.js.window import document
+
 _id = 0
 _prefix = "m3-"
 
@@ -10,3 +12,24 @@ def gen_id():
 
 def noop(*args, **kws):
     pass
+
+
+def element_from_html(html):
+    """parse html into a detached element, e.g. a prototype to clone"""
+    template = document.createElement('template')
+    template.innerHTML = html
+    return template.content.firstElementChild
+
+
+class BuiltDomNodes:
+    """Mixin for components that build some of their dom nodes themselves (e.g. by
+    cloning a prototype element) rather than getting them from the template's html.
+    Store the built dom_nodes dict in self._dom_nodes."""
+
+    _dom_nodes = None
+
+    @property
+    def dom_nodes(self):
+        if self._dom_nodes is None:
+            return super().dom_nodes
+        return self._dom_nodes
@@ -0,0 +1,51 @@
+from anvil.js.window import document
+
+# A single document listener is installed per event type, and shared by every
+# component that needs document events. Components only subscribe while they
+# are interested (e.g. while a menu is open or a dropdown has focus), so each
+# event is routed to a handful of handlers rather than to every mounted menu.
+_handlers = {}
+_listeners = {}
+
+
+def _make_listener(event_type):
+    def listener(event):
+        # copy, since handlers may unsubscribe while the event is dispatched
+        for handler in list(_handlers.get(event_type, ())):
+            handler(event)
+
+    return listener
+
+
+def subscribe(event_type, handler):
+    """route document events of event_type to handler until unsubscribed"""
+    handlers = _handlers.setdefault(event_type, {})
+    if handler in handlers:
+        return
+    handlers[handler] = None
+    if event_type not in _listeners:
+        listener = _listeners[event_type] = _make_listener(event_type)
+        document.addEventListener(event_type, listener)
+
+
+def unsubscribe(event_type, handler):
+    """stop routing document events of event_type to handler"""
+    handlers = _handlers.get(event_type)
+    if not handlers or handler not in handlers:
+        return
+    del handlers[handler]
+    if not handlers:
+        del _handlers[event_type]
+        document.removeEventListener(event_type, _listeners.pop(event_type))
+
+
+def listener_count():
+    """the number of listeners installed on the document by the dispatcher"""
+    return len(_listeners)
+
+
+def handler_count(event_type=None):
+    """the number of handlers subscribed to event_type, or to any event type"""
+    if event_type is not None:
+        return len(_handlers.get(event_type, ()))
+    return sum(len(handlers) for handlers in _handlers.values())
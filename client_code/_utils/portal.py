@@ -0,0 +1,57 @@
+from anvil.js.window import document
+
+# Floating layers (menus) are moved out of their component and into a single
+# container on the body, so that Anvil containers with overflow hidden don't clip them.
+# A layer is only attached while it is open. The most recently closed layers are kept
+# attached ("warm") so that reopening them doesn't touch the body.
+_container = None
+_warm = []
+_keep_warm = 3
+
+
+def _get_container():
+    global _container
+    if _container is None:
+        _container = document.createElement('div')
+        _container.classList.add('anvil-m3-portal')
+    if not _container.isConnected:
+        document.body.append(_container)
+    return _container
+
+
+def attach(node):
+    """attach node to the portal, e.g. when its menu opens"""
+    container = _get_container()
+    if node in _warm:
+        _warm.remove(node)
+    if not container.contains(node):
+        container.append(node)
+
+
+def release(node):
+    """node is no longer open. It stays attached if it's one of the most recently released"""
+    if node in _warm:
+        _warm.remove(node)
+    _warm.append(node)
+    while len(_warm) > _keep_warm:
+        _warm.pop(0).remove()
+
+
+def detach(node):
+    """remove node from the portal straight away, e.g. when its component is removed"""
+    if node in _warm:
+        _warm.remove(node)
+    node.remove()
+
+
+def set_keep_warm(count):
+    """set how many closed layers stay attached to the portal"""
+    global _keep_warm
+    _keep_warm = max(0, count)
+    while len(_warm) > _keep_warm:
+        _warm.pop(0).remove()
+
+
+def attached_count():
+    """the number of layers currently attached to the portal"""
+    return 0 if _container is None else _container.childElementCount
@@ -2,7 +2,7 @@ import anvil.designer
 from anvil import *
 import anvil
 from anvil.js import get_dom_node
-from anvil.js.window import document
+from anvil.js.window import MutationObserver, document
 from anvil.property_utils import (
     get_margin_styles,
     get_padding_styles,
@@ -16,9 +16,10 @@ from anvil.property_utils import (
     set_element_spacing,
 )
 
-from . import fui, noop
+from . import tooltip
 
 _directions = ("Top", "Right", "Bottom", "Left")
+_MISSING = object()
 
 
 class ComponentTag:
@@ -30,20 +31,198 @@ _TB = anvil.TextBox()
 _TB_NODE = get_dom_node(_TB)
 
 
-def theme_color_to_css(color: str):
+# Resolving a theme colour costs a DOM write and a DOM read, so results are
+# cached by colour string. The cache is bounded and is bypassed in the designer,
+# where the colour scheme can be edited while the app is running.
+# Switching colour scheme restyles the root element or swaps a stylesheet in the
+# head, so the cache is cleared whenever either of those changes.
+_COLOR_CACHE_SIZE = 256
+_color_cache = {}
+_color_cache_stats = {"hits": 0, "misses": 0}
+_scheme_observer = None
+
+
+def _on_scheme_change(*args):
+    _color_cache.clear()
+
+
+def _watch_color_scheme():
+    global _scheme_observer
+    if _scheme_observer is None:
+        _scheme_observer = MutationObserver(_on_scheme_change)
+        _scheme_observer.observe(document.documentElement, {"attributes": True})
+        _scheme_observer.observe(document.head, {"childList": True})
+
+
+def _resolve_color(color):
     _TB.foreground = color
     return _TB_NODE.style.color
 
 
+def theme_color_to_css(color: str):
+    if anvil.designer.in_designer or not isinstance(color, str):
+        return _resolve_color(color)
+    css = _color_cache.get(color)
+    if css is not None:
+        _color_cache_stats["hits"] += 1
+        return css
+    _color_cache_stats["misses"] += 1
+    _watch_color_scheme()
+    css = _resolve_color(color)
+    if len(_color_cache) >= _COLOR_CACHE_SIZE:
+        # dicts keep insertion order, so this evicts the oldest entry
+        del _color_cache[next(iter(_color_cache))]
+    _color_cache[color] = css
+    return css
+
+
+def resolve_many(colors):
+    """Resolve a sequence of theme colours to CSS values in one pass.
+    Falsy colours are passed through unchanged."""
+    resolved = {}
+    rv = []
+    for color in colors:
+        if not color:
+            rv.append(color)
+            continue
+        if color not in resolved:
+            resolved[color] = theme_color_to_css(color)
+        rv.append(resolved[color])
+    return rv
+
+
+def clear_color_cache():
+    """Forget all resolved colours and reset the hit/miss counters.
+    Colour scheme changes made through the root element or a stylesheet
+    clear the cache automatically; call this after changing it any other way."""
+    _color_cache.clear()
+    _color_cache_stats["hits"] = 0
+    _color_cache_stats["misses"] = 0
+
+
+def color_cache_info():
+    return {
+        "hits": _color_cache_stats["hits"],
+        "misses": _color_cache_stats["misses"],
+        "size": len(_color_cache),
+        "max_size": _COLOR_CACHE_SIZE,
+    }
+
+
+# While a property transaction is open, style writes made by the property
+# factories below are recorded rather than applied. When the outermost
+# transaction closes, only the final value for each (node, style) pair is written.
+_pending_styles = None
+_transaction_depth = 0
+
+
+class _PropertyTransaction:
+    def __enter__(self):
+        global _pending_styles, _transaction_depth
+        if not _transaction_depth:
+            _pending_styles = {}
+        _transaction_depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        global _pending_styles, _transaction_depth
+        _transaction_depth -= 1
+        if _transaction_depth:
+            return
+        pending, _pending_styles = _pending_styles, None
+        for (component, dom_node_name, style_prop), value in pending.items():
+            component.dom_nodes[dom_node_name].style[style_prop] = value
+
+
+def property_transaction():
+    """Batch the style writes made while constructing a component:
+
+    with property_transaction():
+        self.init_components(**properties)
+    """
+    return _PropertyTransaction()
+
+
+def init_properties(component, properties):
+    """Initialise a component's properties in a single pass.
+    Module components don't get their default values applied, so the properties
+    named in the component's _defaulted_props_ that weren't passed in are applied
+    first, with their current values. init_components then applies the properties
+    that were passed in. Callbacks that depend on other properties (e.g. hide_text
+    on type) are named in _reapplied_props_, and are applied again last, in that
+    order, if they were passed in."""
+    with property_transaction():
+        for name in getattr(component, "_defaulted_props_", ()):
+            if name not in properties:
+                setattr(component, name, getattr(component, name))
+        component.init_components(**properties)
+        for name in getattr(component, "_reapplied_props_", ()):
+            if name in properties:
+                setattr(component, name, getattr(component, name))
+
+
+def _set_style(component, dom_node_name, style_prop, value):
+    if _pending_styles is not None:
+        _pending_styles[(component, dom_node_name, style_prop)] = value
+    else:
+        component.dom_nodes[dom_node_name].style[style_prop] = value
+
+
 """ REUSABLE PROPERTIES """
 
 
-def property_with_callback(prop, cb, default_value=None):
+# Setters can skip their callback when a property is re-set to the value it
+# already has (e.g. by refresh_data_bindings). Only immutable values are compared,
+# since a list or dict may have been changed in place since it was last applied.
+_COMPARABLE_TYPES = (str, int, float, bool, type(None))
+_skip_unchanged_default = False
+_write_stats = {}
+
+
+def set_skip_unchanged_default(value):
+    """Set whether property setters skip unchanged values by default.
+    A factory's own skip_unchanged argument takes precedence over this."""
+    global _skip_unchanged_default
+    _skip_unchanged_default = bool(value)
+
+
+def get_write_stats():
+    """The number of applied and skipped property writes for each component class.
+    Only setters that skip unchanged values are counted."""
+    return {name: dict(stats) for name, stats in _write_stats.items()}
+
+
+def reset_write_stats():
+    _write_stats.clear()
+
+
+def property_with_callback(prop, cb, default_value=None, skip_unchanged=None):
     def getter(self):
         return self._props.get(prop, default_value)
 
     def setter(self, value):
         self._props[prop] = value
+        skip = _skip_unchanged_default if skip_unchanged is None else skip_unchanged
+        if not skip:
+            cb(self, value)
+            return
+
+        stats = _write_stats.get(type(self).__name__)
+        if stats is None:
+            stats = _write_stats[type(self).__name__] = {"applied": 0, "skipped": 0}
+        if type(value) in _COMPARABLE_TYPES:
+            applied = getattr(self, "_applied_props", None)
+            if applied is None:
+                applied = self._applied_props = {}
+            previous = applied.get(prop, _MISSING)
+            if type(previous) is type(value) and previous == value:
+                stats["skipped"] += 1
+                return
+            applied[prop] = value
+        else:
+            getattr(self, "_applied_props", {}).pop(prop, None)
+
+        stats["applied"] += 1
         cb(self, value)
 
     return property(getter, setter)
@@ -59,20 +238,22 @@ def property_without_callback(prop, default_value=None):
     return property(getter, setter)
 
 
-def color_property(dom_node_name, style_prop, prop_name, default_value=None):
+def color_property(
+    dom_node_name, style_prop, prop_name, default_value=None, skip_unchanged=None
+):
     def set_color(self, value):
         if value:
             value = theme_color_to_css(value)
-        self.dom_nodes[dom_node_name].style[style_prop] = value
+        _set_style(self, dom_node_name, style_prop, value)
 
-    return property_with_callback(prop_name, set_color, default_value)
+    return property_with_callback(prop_name, set_color, default_value, skip_unchanged)
 
 
-def style_property(dom_node_name, style_prop, prop_name):
+def style_property(dom_node_name, style_prop, prop_name, skip_unchanged=None):
     def set_style(self, value):
-        self.dom_nodes[dom_node_name].style[style_prop] = value
+        _set_style(self, dom_node_name, style_prop, value)
 
-    return property_with_callback(prop_name, set_style)
+    return property_with_callback(prop_name, set_style, skip_unchanged=skip_unchanged)
 
 
 def innerHTML_property(dom_node_name, prop_name="text"):
@@ -132,9 +313,9 @@ def value_property(dom_node_name, prop_name="value"):
 def underline_property(dom_node_name, prop_name="underline"):
     def set_underline(self, value):
         if value:
-            self.dom_nodes[dom_node_name].style.textDecoration = 'underline'
+            _set_style(self, dom_node_name, 'textDecoration', 'underline')
         else:
-            self.dom_nodes[dom_node_name].style.textDecoration = 'none'
+            _set_style(self, dom_node_name, 'textDecoration', 'none')
 
     return property_with_callback(prop_name, set_underline)
 
@@ -142,9 +323,9 @@ def underline_property(dom_node_name, prop_name="underline"):
 def italic_property(dom_node_name, prop_name="italic"):
     def set_italic(self, value):
         if value:
-            self.dom_nodes[dom_node_name].style.fontStyle = 'italic'
+            _set_style(self, dom_node_name, 'fontStyle', 'italic')
         else:
-            self.dom_nodes[dom_node_name].style.fontStyle = 'normal'
+            _set_style(self, dom_node_name, 'fontStyle', 'normal')
 
     return property_with_callback(prop_name, set_italic)
 
@@ -156,9 +337,9 @@ def bold_property(dom_node_name, prop_name="bold"):
 def custom_bold_property(dom_node_name, prop_name="bold", custom_bold=500):
     def set_bold(self, value):
         if value:
-            self.dom_nodes[dom_node_name].style.fontWeight = custom_bold
+            _set_style(self, dom_node_name, 'fontWeight', custom_bold)
         else:
-            self.dom_nodes[dom_node_name].style.fontWeight = 'normal'
+            _set_style(self, dom_node_name, 'fontWeight', 'normal')
 
     return property_with_callback(prop_name, set_bold)
 
@@ -168,21 +349,21 @@ def font_size_property(dom_node_name, prop_name="font_size"):
         self._font_size = value
         if value:
             value = f'{value}px'
-        self.dom_nodes[dom_node_name].style.fontSize = value
+        _set_style(self, dom_node_name, 'fontSize', value)
 
     return property_with_callback(prop_name, set_font_size)
 
 
 def font_family_property(dom_node_name, prop_name="font_family"):
     def set_font_family(self, value):
-        self.dom_nodes[dom_node_name].style.fontFamily = value
+        _set_style(self, dom_node_name, 'fontFamily', value)
 
     return property_with_callback(prop_name, set_font_family)
 
 
 def border_property(dom_node_name, prop_name="border"):
     def set_border(self, value):
-        self.dom_nodes[dom_node_name].style.border = value
+        _set_style(self, dom_node_name, 'border', value)
 
     return property_with_callback(prop_name, set_border)
 
@@ -228,42 +409,36 @@ def role_property(dom_node_name, prop_name="role"):
 
 
 def tooltip_property(dom_node_name, prop_name="tooltip"):
-    # To use this property, add self._tooltip_node = None to the init of your component
+    def show_tooltip(self):
+        text = self._props.get(prop_name)
+        if text:
+            tooltip.show(self, self.dom_nodes[dom_node_name], text)
+
+    def hide_tooltip(self):
+        tooltip.hide(self)
+
     def set_tooltip(self, value):
         if anvil.designer.in_designer:
             return
 
-        self._cleanup = noop
-        reference_element = self.dom_nodes[dom_node_name]
-        if value:
-            self._tooltip_node = document.createElement('div')
-            self._tooltip_node.innerText = value
-            self._tooltip_node.classList.add('anvil-m3-tooltip')
-            document.body.append(self._tooltip_node)
-            self.reference_element = self.dom_nodes[dom_node_name]
-
-            def show_tooltip(e):
-                self._tooltip_node.style.opacity = 1
-
-            def hide_tooltip(e):
-                self._tooltip_node.style.opacity = 0
-
+        if value and not getattr(self, "_tooltip_listening", False):
+            # Listeners are added once, the first time the component gets a tooltip.
+            # The shared tooltip is only positioned while it is being shown.
+            self._tooltip_listening = True
+            reference_element = self.dom_nodes[dom_node_name]
             tooltip_events = {
-                'mouseenter': show_tooltip,
-                'mouseleave': hide_tooltip,
-                'focus': show_tooltip,
-                'blur': hide_tooltip,
+                'mouseenter': lambda e: show_tooltip(self),
+                'mouseleave': lambda e: hide_tooltip(self),
+                'focus': lambda e: show_tooltip(self),
+                'blur': lambda e: hide_tooltip(self),
             }
             for event, listener in tooltip_events.items():
                 reference_element.addEventListener(event, listener)
-            self._cleanup = fui.auto_update(
-                reference_element, self._tooltip_node, placement="bottom-start"
+            self.add_event_handler(
+                "x-anvil-page-removed", lambda **e: hide_tooltip(self)
             )
-        else:
-            if self._tooltip_node:
-                self._tooltip_node.remove()
-                self._cleanup()
-                self._cleanup = noop
+
+        tooltip.update(self, value)
 
     return property_with_callback(prop_name, set_tooltip)
 
@@ -284,19 +459,29 @@ def anvil_prop(*args, **kwargs):
       @property
       def my_property(new_value):
         ...
+
+      @anvil_prop(skip_unchanged=True)
+      @property
+      def my_property(new_value):
+        ...
     """
 
-    def get_decorator(default_value=None):
+    def get_decorator(default_value=None, skip_unchanged=None):
         def decorator(prop):
             assert isinstance(prop, property), "expected an @property decorator"
             fn = prop.fget
-            return property_with_callback(fn.__name__, fn, default_value=default_value)
+            return property_with_callback(
+                fn.__name__,
+                fn,
+                default_value=default_value,
+                skip_unchanged=skip_unchanged,
+            )
 
         return decorator
 
     if not args:
         # We have been used as a decorator with kwargs
-        return get_decorator(kwargs.get("default_value"))
+        return get_decorator(kwargs.get("default_value"), kwargs.get("skip_unchanged"))
     else:
         # We have been called as a plain decorator, with no args/kwargs
         return get_decorator()(args[0])
@@ -0,0 +1,65 @@
+from anvil.js.window import ResizeObserver, requestAnimationFrame
+
+# A single ResizeObserver is shared by every component that needs to know when
+# an element changes size. Entries are collected per target and dispatched to
+# the target's callbacks in one batch per frame, with the latest entry for each target.
+_observer = None
+_callbacks = {}
+_pending = {}
+_frame_requested = False
+
+
+def _dispatch(*args):
+    global _frame_requested
+    _frame_requested = False
+    pending = list(_pending.items())
+    _pending.clear()
+    for target, entry in pending:
+        # copy, since callbacks may unsubscribe while the batch is dispatched
+        for callback in list(_callbacks.get(target, ())):
+            callback(entry)
+
+
+def _on_resize(entries, observer):
+    global _frame_requested
+    for entry in entries:
+        _pending[entry.target] = entry
+    if not _frame_requested:
+        _frame_requested = True
+        requestAnimationFrame(_dispatch)
+
+
+def observe(target, callback):
+    """call callback(entry) when target changes size, until unobserved"""
+    global _observer
+    callbacks = _callbacks.setdefault(target, {})
+    if callback in callbacks:
+        return
+    callbacks[callback] = None
+    if _observer is None:
+        _observer = ResizeObserver(_on_resize)
+    if len(callbacks) == 1:
+        _observer.observe(target)
+
+
+def unobserve(target, callback):
+    """stop calling callback when target changes size"""
+    global _observer
+    callbacks = _callbacks.get(target)
+    if not callbacks or callback not in callbacks:
+        return
+    del callbacks[callback]
+    if callbacks:
+        return
+    del _callbacks[target]
+    _pending.pop(target, None)
+    if _callbacks:
+        _observer.unobserve(target)
+    else:
+        _observer.disconnect()
+        _observer = None
+
+
+def subscription_count():
+    """the number of live (target, callback) subscriptions"""
+    return sum(len(callbacks) for callbacks in _callbacks.values())
@@ -0,0 +1,57 @@
+from anvil.js.window import document
+
+from . import fui, noop
+
+# One tooltip element is shared by every component with a tooltip.
+# It is only positioned (and only subscribed to floating-ui's autoUpdate)
+# while the component that owns it is hovered or focused.
+_node = None
+_owner = None
+_cleanup = noop
+
+
+def _get_node():
+    global _node
+    if _node is None:
+        _node = document.createElement('div')
+        _node.classList.add('anvil-m3-tooltip')
+    if not _node.isConnected:
+        document.body.append(_node)
+    return _node
+
+
+def show(owner, reference_el, text):
+    """show the tooltip for owner, positioned against reference_el"""
+    global _owner, _cleanup
+    node = _get_node()
+    _cleanup()
+    _owner = owner
+    node.innerText = text
+    _cleanup = fui.auto_update(reference_el, node, placement="bottom-start")
+    node.style.opacity = 1
+
+
+def hide(owner):
+    """hide the tooltip if owner is the component currently showing it"""
+    global _owner, _cleanup
+    if owner is not _owner:
+        return
+    _cleanup()
+    _cleanup = noop
+    _owner = None
+    _node.style.opacity = 0
+
+
+def update(owner, text):
+    """update the text of the tooltip if owner is currently showing it"""
+    if owner is not _owner:
+        return
+    if text:
+        _node.innerText = text
+    else:
+        hide(owner)
+
+
+def live_subscriptions():
+    """the number of autoUpdate subscriptions held by tooltips (0 or 1)"""
+    return 0 if _owner is None else 1